@@ -0,0 +1,64 @@
+"""
+Helpers shared by the benchmarks of the search result page fixtures.
+"""
+import os
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from people_also_ask.tools import tabulate
+from people_also_ask.backends import BACKENDS, get_parser_backend
+
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "people_also_ask",
+    "tests",
+    "fixtures",
+)
+
+
+def read_fixtures() -> Dict[str, str]:
+    """return html of the fixture pages by filename"""
+    fixtures = {}
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, filename), "r") as fd:
+            fixtures[filename] = fd.read()
+    return fixtures
+
+
+def available_backends() -> List[str]:
+    """return names of the parser backends which are installed"""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_parser_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def measure(func: Callable, repeat: int = 5) -> float:
+    """return the best time in milliseconds of repeat calls of func"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def measure_memory(func: Callable) -> float:
+    """return the peak memory in megabytes allocated while calling func"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def print_table(header: Tuple[str, ...], rows: List[Tuple]):
+    print(tabulate(header=list(header), table=[list(row) for row in rows]))
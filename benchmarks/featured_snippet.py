@@ -0,0 +1,76 @@
+"""
+Time of the featured snippet lookup on the fixture pages,
+two traversals of the document (previous implementation) against one.
+
+    python -m benchmarks.featured_snippet [--repeat N]
+"""
+import argparse
+
+from people_also_ask import parser
+from people_also_ask.backends import get_parser_backend
+from benchmarks.common import measure, print_table, read_fixtures
+
+
+def two_pass_get_featured_snippet_parser(question, document):
+    """previous implementation of parser.get_featured_snippet_parser"""
+
+    def is_single_card_featured_snippet_tag(tag):
+        return (
+            tag.name == "div"
+            and "card-section" in tag.get("class", [])
+            and not tag.text.startswith("Tip:")
+        )
+
+    def lookup_featured_snippet_tag(tag):
+        return (
+            parser.is_simple_featured_snippet_tag(tag)
+            or is_single_card_featured_snippet_tag(tag)
+            or parser.is_multiple_card_snippet_tag(tag)
+            or parser.is_web_results(tag)
+        )
+    whole_page_tag = document.find(parser.is_whole_page_tabs_container)
+    tag = document.find(lookup_featured_snippet_tag)
+    if not (tag and parser.is_simple_featured_snippet_tag(tag)):
+        if whole_page_tag:
+            tag = whole_page_tag
+        elif not tag or tag.name == "h2":
+            return None
+    if parser.is_simple_featured_snippet_tag(tag):
+        return parser.SimpleFeaturedSnippetParser.get_instance(question, tag)
+    if parser.is_multiple_card_snippet_tag(tag):
+        return parser.MultipleCardsFeaturedSnippetTag(question, tag)
+    if is_single_card_featured_snippet_tag(tag):
+        return parser.SingleCardFeaturedSnippetParser(question, tag)
+    if parser.is_whole_page_tabs_container(tag):
+        return parser.WholePageTabContainer(question, tag)
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--repeat", "-r", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    backend = get_parser_backend("html.parser")
+    rows = []
+    for filename, html in read_fixtures().items():
+        document = backend.parse(html)
+        before = two_pass_get_featured_snippet_parser(filename, document)
+        after = parser.get_featured_snippet_parser(filename, document)
+        assert type(before) is type(after) and before.tag is after.tag
+        two_pass_time = measure(
+            lambda: two_pass_get_featured_snippet_parser(filename, document),
+            args.repeat,
+        )
+        one_pass_time = measure(
+            lambda: parser.get_featured_snippet_parser(filename, document),
+            args.repeat,
+        )
+        rows.append((
+            filename, type(after).__name__, f"{two_pass_time:.2f}",
+            f"{one_pass_time:.2f}", f"{two_pass_time / one_pass_time:.1f}x",
+        ))
+    print_table(("page", "parser", "two passes (ms)", "one pass (ms)", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Time of importing people_also_ask in a fresh interpreter,
+as paid by every short-lived worker process.
+
+    python -m benchmarks.import_time [--repeat N]
+"""
+import sys
+import argparse
+import subprocess
+
+from benchmarks.common import print_table
+
+
+STATEMENTS = (
+    "import people_also_ask",
+    "import people_also_ask.tools",
+    "import people_also_ask.request",
+    "from people_also_ask import get_answer",
+    "import people_also_ask.aio",
+)
+
+TIMER = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "{statement}\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def measure_import(statement: str, repeat: int = 5) -> float:
+    """return the best time in milliseconds of statement in a new process"""
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for statement in STATEMENTS:
+        try:
+            duration = measure_import(statement, args.repeat)
+        except subprocess.CalledProcessError:
+            rows.append((statement, "unavailable"))
+            continue
+        rows.append((statement, f"{duration:.1f}"))
+    print_table(("statement", "import (ms)"), rows)
+
+
+if __name__ == "__main__":
+    main()
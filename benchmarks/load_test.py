@@ -0,0 +1,182 @@
+"""
+Throughput of the crawler against the local replay server,
+started in another process so that its CPU is not counted.
+
+    python -m benchmarks.load_test [--nb-pages N] [--concurrency C]
+        [--latency S] [--error-rate R] [--rate-limit-rate R] [--captcha-rate R]
+
+Scenarios:
+    related_questions   generate_related_questions
+    answer              generate_answer
+    data_collector      data_collector.collect_data
+    pipeline            pipeline.generate_answer, parsing in processes
+
+For each scenario, reports pages/s, p50/p99 latency of searches
+(retries included) and CPU time of this process per page,
+which excludes the parsing processes of the pipeline scenario.
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from contextlib import closing, redirect_stdout
+from itertools import islice
+from typing import Callable, List
+
+from people_also_ask import cache, google, data_collector, pipeline
+from people_also_ask.request import session
+from people_also_ask.testing.replay_server import synthesize_graph
+from benchmarks.common import print_table
+
+
+SCENARIOS = ("related_questions", "answer", "data_collector", "pipeline")
+ROOT_QUESTION = "what is question 0?"
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    values = sorted(values)
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(ratio * len(values)))]
+
+
+class RecordedGet(object):
+    """google.get recording the duration of each successful search"""
+
+    def __init__(self, get: Callable):
+        self.get = get
+        self.durations = []
+        self.nb_failures = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, params):
+        start_time = time.perf_counter()
+        try:
+            response = self.get(url, params)
+        except Exception:
+            with self._lock:
+                self.nb_failures += 1
+            raise
+        with self._lock:
+            self.durations.append(time.perf_counter() - start_time)
+        return response
+
+
+def start_server(args) -> subprocess.Popen:
+    """start the replay server, return its process once it listens"""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "people_also_ask.testing.replay_server",
+            "--port", "0",
+            "--nb-questions", str(args.nb_questions),
+            "--latency", str(args.latency),
+            "--jitter", str(args.jitter),
+            "--error-rate", str(args.error_rate),
+            "--rate-limit-rate", str(args.rate_limit_rate),
+            "--captcha-rate", str(args.captcha_rate),
+        ],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    process.url_template = process.stdout.readline().strip()
+    return process
+
+
+def run_scenario(scenario: str, args):
+    nb_pages = args.nb_pages
+    concurrency = args.concurrency
+    if scenario == "related_questions":
+        generator = google.generate_related_questions(
+            ROOT_QUESTION, concurrency=concurrency
+        )
+        with closing(generator):
+            list(islice(generator, nb_pages))
+    elif scenario == "answer":
+        generator = google.generate_answer(
+            ROOT_QUESTION, enhance_search=False, concurrency=concurrency
+        )
+        with closing(generator):
+            list(islice(generator, nb_pages))
+    elif scenario == "data_collector":
+        questions = list(synthesize_graph(args.nb_questions))[:nb_pages]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, "questions.txt")
+            with open(input_file, "w") as fd:
+                fd.write("\n".join(questions))
+            with redirect_stdout(io.StringIO()):
+                data_collector.collect_data(
+                    input_file,
+                    os.path.join(tmp_dir, "answers.json"),
+                    nb_workers=concurrency,
+                )
+    elif scenario == "pipeline":
+        generator = pipeline.generate_answer(
+            ROOT_QUESTION,
+            nb_fetch_threads=concurrency,
+            nb_parse_processes=args.nb_processes,
+        )
+        with closing(generator):
+            list(islice(generator, nb_pages))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", "-s", action="append", choices=SCENARIOS, help="default: all of them")
+    parser.add_argument("--nb-pages", "-n", type=int, default=200, help="questions generated per scenario")
+    parser.add_argument("--nb-questions", type=int, default=5000, help="questions of the synthesized graph")
+    parser.add_argument("--concurrency", "-c", type=int, default=8)
+    parser.add_argument("--nb-processes", "-p", type=int, default=os.cpu_count(), help="parsing processes of the pipeline scenario")
+    parser.add_argument("--backend", help="parser backend, default: the default one")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds of latency of the server")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--captcha-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.backend:
+        from people_also_ask.backends import set_parser_backend
+        set_parser_backend(args.backend)
+    cache.set_cache(None)
+    session.set_rate_limit(10**9, 1, scope="global")
+    session.set_retry_policy(nb_times_retry=5, base_delay=0.05, max_delay=0.5)
+    session.configure_sessions(pool_size=args.concurrency)
+
+    server = start_server(args)
+    google.URL_TEMPLATE = server.url_template
+    original_get = google.get
+    rows = []
+    try:
+        for scenario in args.scenario or SCENARIOS:
+            google.get = recorded_get = RecordedGet(original_get)
+            start_time = time.perf_counter()
+            start_cpu = time.process_time()
+            run_scenario(scenario, args)
+            duration = time.perf_counter() - start_time
+            cpu = time.process_time() - start_cpu
+            nb_pages = len(recorded_get.durations)
+            rows.append((
+                scenario,
+                nb_pages,
+                recorded_get.nb_failures,
+                f"{nb_pages / duration:.1f}",
+                f"{percentile(recorded_get.durations, 0.5) * 1000:.0f}",
+                f"{percentile(recorded_get.durations, 0.99) * 1000:.0f}",
+                f"{cpu / max(nb_pages, 1) * 1000:.1f}",
+            ))
+    finally:
+        google.get = original_get
+        server.terminate()
+        server.wait()
+    print_table((
+        "scenario", "pages", "failures", "pages/s",
+        "p50 (ms)", "p99 (ms)", "cpu/page (ms)",
+    ), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Time of parsing and extraction of the fixture pages for each parser backend.
+
+    python -m benchmarks.parser_backends [--repeat N]
+"""
+import argparse
+
+from people_also_ask.backends import get_parser_backend
+from people_also_ask.parser import create_featured_snippet_parser
+from benchmarks.common import (
+    measure,
+    print_table,
+    read_fixtures,
+    available_backends,
+)
+
+
+def extract(backend, question, document):
+    backend.extract_related_questions(document)
+    tag = backend.get_featured_snippet_tag(document)
+    create_featured_snippet_parser(question, tag).to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for name in available_backends():
+        backend = get_parser_backend(name)
+        for filename, html in read_fixtures().items():
+            document = backend.parse(html)
+            parse_time = measure(lambda: backend.parse(html), args.repeat)
+            extract_time = measure(
+                lambda: extract(backend, filename, document), args.repeat
+            )
+            rows.append((
+                name, filename, f"{parse_time:.1f}", f"{extract_time:.1f}",
+                f"{parse_time + extract_time:.1f}",
+            ))
+    print_table(("backend", "page", "parse (ms)", "extract (ms)", "total (ms)"), rows)
+
+
+if __name__ == "__main__":
+    main()
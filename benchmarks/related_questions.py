@@ -0,0 +1,53 @@
+"""
+Time and peak memory of getting the related questions of the fixture
+pages, parsing the whole page against parsing only the questions.
+
+    python -m benchmarks.related_questions [--repeat N]
+"""
+import argparse
+
+from people_also_ask.backends import get_parser_backend
+from benchmarks.common import (
+    measure,
+    print_table,
+    read_fixtures,
+    measure_memory,
+    available_backends,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = []
+    for name in available_backends():
+        backend = get_parser_backend(name)
+
+        def full_parse(html):
+            return backend.extract_related_questions(backend.parse(html))
+
+        for filename, html in read_fixtures().items():
+            assert full_parse(html) == backend.parse_related_questions(html)
+            full_time = measure(lambda: full_parse(html), args.repeat)
+            questions_time = measure(
+                lambda: backend.parse_related_questions(html), args.repeat
+            )
+            full_memory = measure_memory(lambda: full_parse(html))
+            questions_memory = measure_memory(
+                lambda: backend.parse_related_questions(html)
+            )
+            rows.append((
+                name, filename,
+                f"{full_time:.1f}", f"{questions_time:.1f}",
+                f"{full_memory:.1f}", f"{questions_memory:.1f}",
+            ))
+    print_table((
+        "backend", "page", "full (ms)", "questions only (ms)",
+        "full (MB)", "questions only (MB)",
+    ), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Time and peak memory of each parsing stage of the fixture pages
+for each parser backend, compared against a stored baseline.
+
+    python -m benchmarks.suite [--repeat N] [--save-baseline FILE]
+    python -m benchmarks.suite --baseline FILE [--threshold 0.2]
+
+Stages:
+    parse               html to document
+    related_questions   extract_related_questions of the document
+    featured_snippet    featured snippet tag and parser of the document
+    to_dict             featured snippet parser to_dict
+    full                html to answer, as done by a search
+
+With --baseline, exits with status 1 when the time or the peak memory
+of a stage grows more than --threshold (relative) above the baseline.
+"""
+import sys
+import copy
+import json
+import argparse
+import platform
+from typing import Callable, Dict, List, Tuple
+
+from people_also_ask.serp import SerpResult
+from people_also_ask.backends import get_parser_backend
+from people_also_ask.parser import create_featured_snippet_parser
+from benchmarks.common import (
+    measure,
+    print_table,
+    read_fixtures,
+    measure_memory,
+    available_backends,
+)
+
+
+STAGES = ("parse", "related_questions", "featured_snippet", "to_dict", "full")
+THRESHOLD = 0.2
+# differences below these are noise, whatever the ratio
+MIN_TIME_DELTA = 0.5  # milliseconds
+MIN_MEMORY_DELTA = 0.1  # megabytes
+
+
+def get_stages(name: str, question: str, html: str) -> Dict[str, Callable]:
+    """return the function of each stage of parsing html with backend name"""
+    backend = get_parser_backend(name)
+    document = backend.parse(html)
+
+    def featured_snippet():
+        tag, kind = backend.find_featured_snippet_tag(document)
+        return create_featured_snippet_parser(question, tag, kind)
+
+    tag, kind = backend.find_featured_snippet_tag(document)
+    # never used, copied by to_dict whose fields are computed once per parser
+    unused_parser = create_featured_snippet_parser(question, tag, kind)
+
+    def to_dict():
+        if not unused_parser:
+            return None
+        return copy.copy(unused_parser).to_dict()
+
+    return {
+        "parse": lambda: backend.parse(html),
+        "related_questions": lambda: backend.extract_related_questions(document),
+        "featured_snippet": featured_snippet,
+        "to_dict": to_dict,
+        "full": lambda: SerpResult(question, html, backend=name).answer,
+    }
+
+
+def run(repeat: int = 5, backends: List[str] = None) -> Dict[str, Dict]:
+    """return time (ms) and peak memory (MB) of each backend/page/stage"""
+    results = {}
+    for name in backends or available_backends():
+        for filename, html in read_fixtures().items():
+            question = filename.rsplit(".", 1)[0].replace("_", " ")
+            for stage, func in get_stages(name, question, html).items():
+                results[f"{name}/{filename}/{stage}"] = {
+                    "time": measure(func, repeat),
+                    "memory": measure_memory(func),
+                }
+    return results
+
+
+def compare(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    threshold: float = THRESHOLD,
+) -> List[Tuple[str, str, float, float]]:
+    """return (key, metric, baseline, result) of the regressions"""
+    min_deltas = {"time": MIN_TIME_DELTA, "memory": MIN_MEMORY_DELTA}
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric, min_delta in min_deltas.items():
+            before, after = baseline[key][metric], result[metric]
+            if after - before > max(before * threshold, min_delta):
+                regressions.append((key, metric, before, after))
+    return regressions
+
+
+def summarize(results: Dict[str, Dict]) -> List[Tuple]:
+    """return one row per backend and page"""
+    rows = []
+    pages = sorted({key.rsplit("/", 1)[0] for key in results})
+    for page in pages:
+        times = [results[f"{page}/{stage}"]["time"] for stage in STAGES]
+        full = results[f"{page}/full"]
+        rows.append((
+            *page.split("/"),
+            *(f"{time:.1f}" for time in times),
+            f"{full['memory']:.1f}",
+            f"{1000 / full['time']:.0f}",
+        ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", "-r", type=int, default=5)
+    parser.add_argument("--backend", "-b", action="append", help="parser backend to measure, default: all installed ones")
+    parser.add_argument("--save-baseline", help="write the results to this json file")
+    parser.add_argument("--baseline", help="json file of results to compare with")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="relative growth above the baseline counted as a regression")
+    args = parser.parse_args()
+
+    results = run(repeat=args.repeat, backends=args.backend)
+    print_table(
+        ("backend", "page", *(f"{stage} (ms)" for stage in STAGES),
+         "full (MB)", "pages/s"),
+        summarize(results),
+    )
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as fd:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results,
+            }, fd, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, "r") as fd:
+            baseline = json.load(fd)["results"]
+        regressions = compare(results, baseline, threshold=args.threshold)
+        if regressions:
+            print()
+            print_table(
+                ("regression", "metric", "baseline", "result"),
+                [
+                    (key, metric, f"{before:.2f}", f"{after:.2f}")
+                    for key, metric, before, after in regressions
+                ],
+            )
+            sys.exit(1)
+        print(f"\nNo regression above {args.threshold:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
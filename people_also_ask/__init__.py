@@ -1,8 +1,41 @@
 #! /usr/bin/env python3
-from people_also_ask.google import (
-    get_answer,
-    generate_answer,
-    get_simple_answer,
-    get_related_questions,
-    generate_related_questions,
-)
+"""
+Functions are imported from their module at first use,
+so that importing people_also_ask doesn't load the parser
+and the http stack.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from people_also_ask.google import (
+        get_answer,
+        generate_answer,
+        get_simple_answer,
+        get_related_questions,
+        generate_related_questions,
+    )
+
+
+_LAZY_ATTRIBUTES = {
+    "get_answer": "people_also_ask.google",
+    "generate_answer": "people_also_ask.google",
+    "get_simple_answer": "people_also_ask.google",
+    "get_related_questions": "people_also_ask.google",
+    "generate_related_questions": "people_also_ask.google",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,10 @@
+#! /usr/bin/env python3
+from people_also_ask.aio.google import (
+    search,
+    get_answer,
+    generate_answer,
+    get_simple_answer,
+    get_related_questions,
+    generate_related_questions,
+)
+from people_also_ask.aio.session import close
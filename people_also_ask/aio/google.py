@@ -0,0 +1,204 @@
+#! /usr/bin/env python3
+import asyncio
+from typing import List, Dict, Any, Optional, AsyncGenerator
+
+from people_also_ask import metrics
+from people_also_ask.cache import get_cache, make_key
+from people_also_ask.google import (
+    URL,
+    get_url,
+    get_search_params,
+)
+from people_also_ask.serp import SerpResult
+from people_also_ask.aio.session import get
+
+
+async def get_page(keyword: str, url: str = URL, use_cache: bool = True) -> str:
+    """
+    return html of google search result,
+    from the cache if it has been searched recently
+
+    :param str keyword: text to search
+    :param str url: google search url
+    :param bool use_cache: False to bypass the cache
+    """
+    params = get_search_params(keyword)
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        key = make_key(url, params)
+        html = cache.get(key)
+        metrics.inc(
+            "paa_cache_lookups", result="miss" if html is None else "hit"
+        )
+        if html is not None:
+            return html
+    with metrics.timer("paa_search_seconds"):
+        html = await get(url, params=params)
+    if cache is not None:
+        cache.set(key, html)
+    return html
+
+
+async def search(
+    keyword: str,
+    url: str = URL,
+    use_cache: bool = True,
+    backend: Optional[str] = None,
+) -> SerpResult:
+    """
+    return google search result, parsed when first needed
+
+    :param str keyword: text to search
+    :param str url: google search url
+    :param bool use_cache: False to bypass the cache
+    :param str backend: name of the parser backend, default one if None
+    """
+    html = await get_page(keyword, url=url, use_cache=use_cache)
+    return SerpResult(keyword, html, backend=backend)
+
+
+async def extract(serp: SerpResult, facet: str) -> Any:
+    """
+    return a facet of a search result, such as "answer",
+    it is extracted in an executor to keep the event loop fetching
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, getattr, serp, facet)
+
+
+async def _get_related_questions(
+    text: str, domain: str="com", use_cache: bool = True
+) -> List[str]:
+    """
+    return a list of questions related to text.
+    These questions are from search result of text
+
+    :param str text: text to search
+    :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
+    """
+    serp = await search(text, url=get_url(domain), use_cache=use_cache)
+    return await extract(serp, "related_questions")
+
+
+async def generate_related_questions(
+    text: str, domain: str="com", use_cache: bool = True
+) -> AsyncGenerator[str, None]:
+    """
+    generate the questions related to text,
+    these quetions are found recursively
+
+    :param str text: text to search
+    :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
+    """
+    questions = set(await _get_related_questions(
+        text, domain=domain, use_cache=use_cache
+    ))
+    searched_text = {text}
+    while questions:
+        text = questions.pop()
+        yield text
+        searched_text.add(text)
+        questions |= set(await _get_related_questions(
+            text, domain=domain, use_cache=use_cache
+        ))
+        questions -= searched_text
+
+
+async def get_related_questions(
+    text: str,
+    max_nb_questions: Optional[int] = None,
+    domain: str="com",
+    use_cache: bool = True,
+) -> List[str]:
+    """
+    return a number of questions related to text.
+    These questions are found recursively.
+
+    :param str text: text to search
+    :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
+    """
+    if max_nb_questions is None:
+        return await _get_related_questions(
+            text, domain=domain, use_cache=use_cache
+        )
+    questions = []
+    if max_nb_questions <= 0:
+        return questions
+    generator = generate_related_questions(
+        text, domain=domain, use_cache=use_cache
+    )
+    try:
+        async for question in generator:
+            questions.append(question)
+            if len(questions) >= max_nb_questions:
+                break
+    finally:
+        await generator.aclose()
+    return questions
+
+
+async def get_answer(
+    question: str, domain: str="com", use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    return a dictionary as answer for a question.
+
+    :param str question: asked question
+    :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
+    """
+    serp = await search(question, url=get_url(domain), use_cache=use_cache)
+    return await extract(serp, "answer")
+
+
+async def generate_answer(
+    text: str, domain: str="com", use_cache: bool = True
+) -> AsyncGenerator[dict, None]:
+    """
+    generate answers of questions related to text
+
+    :param str text: text to search
+    :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
+    """
+    answer = await get_answer(text, domain, use_cache=use_cache)
+    questions = set(answer["related_questions"])
+    searched_text = {text}
+    if answer["has_answer"]:
+        yield answer
+    while questions:
+        text = questions.pop()
+        searched_text.add(text)
+        answer = await get_answer(text, domain, use_cache=use_cache)
+        if answer["has_answer"]:
+            yield answer
+        questions |= set(answer["related_questions"])
+        questions -= searched_text
+
+
+async def get_simple_answer(
+    question: str, depth: bool = False, domain: str="com", use_cache: bool = True
+) -> str:
+    """
+    return a text as summary answer for the question
+
+    :param str question: asked quetion
+    :param bool depth: return the answer of first related question
+        if no answer found for question
+    :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
+    """
+    serp = await search(question, url=get_url(domain), use_cache=use_cache)
+    if await extract(serp, "has_answer"):
+        return await extract(serp, "simple_answer")
+    if depth:
+        related_questions = await extract(serp, "related_questions")
+        if not related_questions:
+            return ""
+        return await get_simple_answer(
+            related_questions[0], domain=domain, use_cache=use_cache
+        )
+    return ""
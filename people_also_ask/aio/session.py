@@ -0,0 +1,155 @@
+import os
+import time
+import asyncio
+import logging
+import traceback
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    raise ImportError(
+        "people_also_ask.aio requires aiohttp,"
+        " install it with `pip install people_also_ask[aio]`"
+    )
+
+from people_also_ask import metrics
+from people_also_ask.exceptions import RequestError
+from people_also_ask.request import session as _sync_session
+from people_also_ask.request.retry import (
+    NETWORK_ERROR,
+    THROTTLED_FAILURES,
+    classify_response,
+    parse_retry_after,
+)
+
+
+NB_CONNECTIONS_LIMIT = int(os.environ.get(
+    "RELATED_QUESTION_NB_CONNECTIONS_LIMIT", 50
+))
+NB_CONNECTIONS_PER_HOST_LIMIT = int(os.environ.get(
+    "RELATED_QUESTION_NB_CONNECTIONS_PER_HOST_LIMIT", 0  # unlimited
+))
+
+logger = logging.getLogger(__name__)
+
+# event loop: (http session, sync session pool it was configured from)
+_SESSIONS = WeakKeyDictionary()
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    return the http session of the running event loop,
+    connections are pooled and bounded by NB_CONNECTIONS_LIMIT,
+    the timeouts of configure_sessions are applied
+    """
+    loop = asyncio.get_running_loop()
+    session_pool = _sync_session.sessions
+    session, configured_pool = _SESSIONS.get(loop, (None, None))
+    if session is not None and configured_pool is not session_pool:
+        # configure_sessions was called since
+        loop.create_task(session.close())
+        session = None
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=NB_CONNECTIONS_LIMIT,
+            limit_per_host=NB_CONNECTIONS_PER_HOST_LIMIT,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=session_pool.connect_timeout,
+                sock_read=session_pool.read_timeout,
+            ),
+        )
+        _SESSIONS[loop] = (session, session_pool)
+    return session
+
+
+async def close():
+    """close the http session of the running event loop"""
+    session, _ = _SESSIONS.pop(asyncio.get_running_loop(), (None, None))
+    if session is not None:
+        await session.close()
+
+
+async def _get(
+    url: str, params, proxies: dict, remaining: Optional[float] = None
+) -> str:
+    proxy_pool = _sync_session.get_proxy_pool()
+    session_pool = _sync_session.sessions
+    # header and query parameters name the same browser
+    user_agent = _sync_session.get_user_agent(proxies)
+    params = {**_sync_session.get_browser_params(user_agent), **params}
+    stop_time = None if remaining is None else time.monotonic() + remaining
+    limiter = _sync_session.get_rate_limiter(url, proxies)
+    if await limiter.acquire_async(max_wait=remaining) is None:
+        raise _sync_session.deadline_error(url, params, proxies)
+    if stop_time is not None:
+        remaining = max(0.0, stop_time - time.monotonic())
+    start_time = time.monotonic()
+    try:
+        async with get_session().get(
+            url,
+            params=params,
+            proxy=proxies.get("https"),
+            headers=_sync_session.get_headers(user_agent=user_agent),
+            timeout=aiohttp.ClientTimeout(
+                total=remaining,
+                sock_connect=session_pool.connect_timeout,
+                sock_read=session_pool.read_timeout,
+            ),
+        ) as response:
+            text = await response.text()
+    except Exception:
+        proxy_pool.report_failure(proxies)
+        metrics.inc("paa_requests", outcome=NETWORK_ERROR)
+        raise RequestError(
+            url, params, proxies, traceback.format_exc(),
+            failure=NETWORK_ERROR,
+        )
+    latency = time.monotonic() - start_time
+    failure = classify_response(response.status, str(response.url), text)
+    metrics.inc("paa_requests", outcome=failure or "ok")
+    metrics.observe("paa_request_seconds", latency, outcome=failure or "ok")
+    if failure is not None:
+        proxy_pool.report_failure(
+            proxies, throttled=failure in THROTTLED_FAILURES
+        )
+        raise RequestError(
+            url, params, proxies, text,
+            failure=failure,
+            status_code=response.status,
+            retry_after=parse_retry_after(
+                response.headers.get("Retry-After")
+            ),
+        )
+    proxy_pool.report_success(proxies, latency)
+    return text
+
+
+async def get(url: str, params) -> str:
+    """
+    return the body of a successful GET request on url,
+    retried through another proxy following the retry policy
+    """
+    policy = _sync_session.retry_policy
+    stop_time = policy.start()
+    proxies = None
+    nb_attempts = 0
+    while True:
+        proxies = _sync_session.get_proxy_pool().get(exclude=proxies)
+        try:
+            return await _get(url, params, proxies, policy.remaining(stop_time))
+        except RequestError as error:
+            nb_attempts += 1
+            delay = policy.next_delay(error, nb_attempts, stop_time)
+            if delay is None:
+                raise
+            logger.debug(
+                "Retrying %s in %.2fs after %s", url, delay, error.failure
+            )
+            metrics.inc("paa_retries", failure=error.failure)
+            metrics.observe("paa_retry_wait_seconds", delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,188 @@
+#! /usr/bin/env python3
+"""
+Backends parsing search result pages.
+
+Each backend builds a document from the html of a page, extracts the
+related questions from it and locates the featured snippet, which is
+returned as a BeautifulSoup tag for the featured snippet parsers.
+"""
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+from typing import Any, List, Optional, Tuple
+
+from people_also_ask import parser
+
+
+PARSER_BACKEND = os.environ.get(
+    "RELATED_QUESTION_PARSER_BACKEND", "html.parser"
+)
+
+
+RELATED_QUESTIONS_STRAINER = SoupStrainer("div", class_="related-question-pair")
+
+
+class ParserBackend(object):
+    """Base class of parser backends"""
+
+    name = None
+
+    def parse(self, html: str) -> Any:
+        raise NotImplementedError
+
+    def extract_related_questions(self, document: Any) -> List[str]:
+        raise NotImplementedError
+
+    def parse_related_questions(self, html: str) -> List[str]:
+        """
+        return the related questions of a page,
+        when the rest of the page is not needed
+        """
+        return self.extract_related_questions(self.parse(html))
+
+    def find_featured_snippet_tag(
+        self, document: Any
+    ) -> Tuple[Optional[Tag], Optional[str]]:
+        """return the featured snippet tag of document and its kind"""
+        raise NotImplementedError
+
+    def get_featured_snippet_tag(self, document: Any) -> Optional[Tag]:
+        return self.find_featured_snippet_tag(document)[0]
+
+
+class BeautifulSoupBackend(ParserBackend):
+    """Backend parsing pages with BeautifulSoup and a tree builder"""
+
+    def __init__(self, features: str = "html.parser"):
+        self.name = features
+        self.features = features
+        # fail early if the tree builder is not installed
+        BeautifulSoup("", features)
+
+    def parse(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, self.features)
+
+    def extract_related_questions(self, document: BeautifulSoup) -> List[str]:
+        return parser.extract_related_questions(document)
+
+    def parse_related_questions(self, html: str) -> List[str]:
+        """only the related questions are built into the tree"""
+        document = BeautifulSoup(
+            html, self.features, parse_only=RELATED_QUESTIONS_STRAINER
+        )
+        return parser.extract_related_questions(document)
+
+    def find_featured_snippet_tag(
+        self, document: BeautifulSoup
+    ) -> Tuple[Optional[Tag], Optional[str]]:
+        return parser.find_featured_snippet_tag(document)
+
+
+class SelectolaxBackend(ParserBackend):
+    """
+    Backend parsing pages with selectolax (lexbor).
+    Only the featured snippet is parsed again by BeautifulSoup.
+    """
+
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            raise ImportError(
+                "selectolax parser backend requires selectolax,"
+                " install it with `pip install selectolax`"
+            )
+        self._parser_class = LexborHTMLParser
+
+    def parse(self, html: str) -> Any:
+        return self._parser_class(html)
+
+    def extract_related_questions(self, document: Any) -> List[str]:
+        return [
+            node.text(deep=True).split('Search for:')[0]
+            for node in document.css("div.related-question-pair")
+        ]
+
+    @staticmethod
+    def _text(node) -> str:
+        return node.text(deep=True) if node is not None else ""
+
+    def _classify_node(self, node) -> Optional[str]:
+        """selectolax version of parser.classify_featured_snippet_tag"""
+        if node.tag == "div":
+            classes = (node.attributes.get("class") or "").split()
+            if classes == ["xpdopen"]:
+                if self._text(node.css_first("h2")) != "People also ask":
+                    return parser.SIMPLE_FEATURED_SNIPPET
+                return None
+            if (
+                "card-section" in classes
+                and not self._text(node).startswith("Tip:")
+            ):
+                return parser.SINGLE_CARD_FEATURED_SNIPPET
+            return None
+        if node.tag == "g-section-with-header":
+            return parser.MULTIPLE_CARDS_FEATURED_SNIPPET
+        if node.tag == "h2" and self._text(node) == "Web results":
+            return parser.WEB_RESULTS
+        return None
+
+    def find_featured_snippet_tag(
+        self, document: Any
+    ) -> Tuple[Optional[Tag], Optional[str]]:
+        node = kind = None
+        for candidate in document.css(
+            "div.xpdopen, div.card-section, g-section-with-header, h2"
+        ):
+            kind = self._classify_node(candidate)
+            if kind is not None:
+                node = candidate
+                break
+        if kind == parser.SIMPLE_FEATURED_SNIPPET:
+            return self._to_tag(node), kind
+        whole_page_node = document.css_first("#wp-tabs-container")
+        if whole_page_node is not None:
+            return self._to_tag(whole_page_node), (
+                self._classify_node(whole_page_node)
+                or parser.WHOLE_PAGE_TABS_CONTAINER
+            )
+        if node is None or kind == parser.WEB_RESULTS:
+            return None, None
+        return self._to_tag(node), kind
+
+    @staticmethod
+    def _to_tag(node) -> Tag:
+        return BeautifulSoup(node.html, "html.parser").find(True)
+
+
+BACKENDS = {
+    "html.parser": lambda: BeautifulSoupBackend("html.parser"),
+    "lxml": lambda: BeautifulSoupBackend("lxml"),
+    "selectolax": SelectolaxBackend,
+}
+_INSTANCES = {}
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """
+    return the parser backend named name,
+    the default one if name is None
+    """
+    name = name or PARSER_BACKEND
+    if name not in _INSTANCES:
+        if name not in BACKENDS:
+            raise ValueError(
+                f"Unknown parser backend {name!r},"
+                f" choose one of {', '.join(BACKENDS)}"
+            )
+        _INSTANCES[name] = BACKENDS[name]()
+    return _INSTANCES[name]
+
+
+def set_parser_backend(name: str):
+    """set the default parser backend"""
+    global PARSER_BACKEND
+    get_parser_backend(name)
+    PARSER_BACKEND = name
@@ -0,0 +1,198 @@
+#! /usr/bin/env python3
+"""
+Cache of google search result pages.
+"""
+import os
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+# pages kept in memory, caching is disabled if 0
+CACHE_SIZE = int(os.environ.get(
+    "RELATED_QUESTION_CACHE_SIZE", 0
+))
+DEFAULT_MEMORY_CACHE_SIZE = 128
+CACHE_TTL = float(os.environ.get(
+    "RELATED_QUESTION_CACHE_TTL", 3600  # seconds
+))
+CACHE_FILE = os.environ.get("RELATED_QUESTION_CACHE_FILE")
+
+# parameters derived from the user agent, they don't change the result
+IGNORED_PARAMS = ("client", "sourceid")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def make_key(url: str, params: Dict[str, str]) -> str:
+    """return the cache key of a search on url with params"""
+    items = []
+    for name, value in sorted(params.items()):
+        if name in IGNORED_PARAMS:
+            continue
+        if name == "q":
+            value = normalize_query(value)
+        items.append(f"{name}={value}")
+    return url + "?" + "&".join(items)
+
+
+class BaseCache(object):
+    """
+    Cache of search result pages, entries expire after ttl seconds.
+    Subclasses implement _get, _set and clear.
+    """
+
+    def __init__(self, ttl: Optional[float] = CACHE_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        raise NotImplementedError
+
+    def _set(self, key: str, value: str, expires_at: Optional[float]):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                with self._lock:
+                    self.hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.time() + ttl
+        self._set(key, value, expires_at)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class MemoryCache(BaseCache):
+    """Least-recently-used cache holding up to size pages in memory"""
+
+    def __init__(
+        self,
+        size: int = CACHE_SIZE or DEFAULT_MEMORY_CACHE_SIZE,
+        ttl: Optional[float] = CACHE_TTL,
+    ):
+        super().__init__(ttl=ttl)
+        self.size = size
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(BaseCache):
+    """Cache storing zlib-compressed pages in a sqlite database"""
+
+    def __init__(self, path: str, ttl: Optional[float] = CACHE_TTL):
+        super().__init__(ttl=ttl)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " expires_at REAL"
+                ")"
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM pages"
+            ).fetchone()[0]
+
+    def _get(self, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        return zlib.decompress(value).decode("utf-8"), expires_at
+
+    def _set(self, key, value, expires_at):
+        value = zlib.compress(value.encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM pages")
+
+    def purge_expired(self):
+        """delete expired pages from the database"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM pages WHERE expires_at <= ?", (time.time(),)
+            )
+
+    def close(self):
+        self._connection.close()
+
+
+def _load_cache() -> Optional[BaseCache]:
+    if CACHE_FILE:
+        return SQLiteCache(CACHE_FILE)
+    if CACHE_SIZE > 0:
+        return MemoryCache()
+    return None
+
+
+def set_cache(cache: Optional[BaseCache]):
+    """set the cache of search result pages, None disables caching"""
+    global CACHE
+    CACHE = cache
+
+
+def get_cache() -> Optional[BaseCache]:
+    return CACHE
+
+
+set_cache(_load_cache())
@@ -0,0 +1,74 @@
+#! /usr/bin/env python3
+"""
+Breadth-first crawl of the graph of related questions.
+"""
+import os
+from itertools import count
+from collections import deque
+from concurrent.futures import (
+    Executor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+from typing import Any, Callable, Iterable, Generator, List, Optional, Tuple
+
+
+NB_CONCURRENT_REQUESTS = int(os.environ.get(
+    "RELATED_QUESTION_NB_CONCURRENT_REQUESTS", 1
+))
+
+
+def crawl(
+    text: str,
+    fetch: Callable[[str], Any],
+    get_children: Callable[[Any], Iterable[str]],
+    concurrency: int = NB_CONCURRENT_REQUESTS,
+    executor: Optional[Executor] = None,
+) -> Generator[Tuple[str, Any, List[str]], None, None]:
+    """
+    crawl questions from text, expanding up to concurrency questions
+    at the same time.
+
+    Generate (question, result, new_questions) as soon as the result of
+    a question is fetched, new_questions being its children which have
+    not been discovered yet, in order of discovery.
+    Closing the generator cancels the fetches still queued in a shared
+    executor; fetches already running (all of them with an executor of
+    its own) complete and their results are dropped.
+
+    :param str text: text to start from
+    :param fetch: return the result of a question
+    :param get_children: return the questions related to a result
+    :param int concurrency: maximum number of fetches in flight
+    :param executor: run the fetches in this executor, shared with other
+        crawls, instead of a thread pool of their own
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be positive, got {concurrency}")
+    discovered = {text}
+    frontier = deque([text])
+    pending = {}
+    submission_order = count()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        while frontier or pending:
+            while frontier and len(pending) < concurrency:
+                question = frontier.popleft()
+                future = executor.submit(fetch, question)
+                pending[future] = (next(submission_order), question)
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: pending[f][0]):
+                _, question = pending.pop(future)
+                result = future.result()
+                new_questions = []
+                for child in get_children(result):
+                    if child not in discovered:
+                        discovered.add(child)
+                        new_questions.append(child)
+                frontier.extend(new_questions)
+                yield question, result, new_questions
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
@@ -1,32 +1,134 @@
 #! /usr/bin/env python3
+import os
+import sys
+import csv
 import time
 import json
+import logging
 import argparse
 import traceback
-from collections import OrderedDict
+from itertools import islice
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Generator, Iterable, Optional
+from people_also_ask import profiling
+from people_also_ask.tools import BloomFilter
 from people_also_ask.google import get_simple_answer
 from people_also_ask.exceptions import (
     InvalidQuestionInputFileError,
     FailedToWriteOuputFileError,
 )
 
+
+FLUSH_EVERY = 10
+INPUT_FORMATS = ("txt", "csv", "jsonl")
+
 def parse_args():
     parser = argparse.ArgumentParser()
 
-    parser.add_argument("--input-file", "-i", help="input file which is a txt file containing list of questions", required=True)
+    parser.add_argument("--input-file", "-i", help="input file containing list of questions, one per line (txt), in the first column (csv) or as a string or a 'question' field (jsonl); - to read stdin", required=True)
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="format of the input file, default: guessed from its extension, txt for stdin")
+    parser.add_argument("--bloom-filter-capacity", type=int, help="remove duplicated questions with a bloom filter sized for this number of questions, using bounded memory but skipping about 0.1%% of questions wrongly")
     parser.add_argument("--output-file", "-o", help="output file which is .json file containing a dictionary of question: answer", required=True)
+    parser.add_argument("--workers", "-w", type=int, default=1, help="number of questions collected at the same time, up to the number of proxies is a good choice")
+    parser.add_argument("--unordered", action="store_true", help="collect answers in order of completion instead of order of questions")
+    parser.add_argument("--checkpoint-file", "-c", help="jsonl file where each answer is appended as soon as it is collected, default: OUTPUT_FILE.jsonl")
+    parser.add_argument("--resume", action="store_true", help="skip questions already answered in the checkpoint file, failed ones are searched again")
+    parser.add_argument("--flush-every", type=int, default=FLUSH_EVERY, help="number of answers buffered before writing them to the checkpoint file")
+    parser.add_argument("--no-compact", action="store_true", help="only write the checkpoint file, not the output .json file")
 
     return parser.parse_args()
 
 
-def read_questions(input_file):
+def guess_input_format(input_file):
+    extension = os.path.splitext(input_file)[1].lstrip(".").lower()
+    if extension in INPUT_FORMATS:
+        return extension
+    if extension == "json":
+        return "jsonl"
+    return "txt"
+
+
+def _parse_questions(fd, input_format):
+    if input_format == "csv":
+        for row in csv.reader(fd):
+            if row:
+                yield row[0]
+    elif input_format == "jsonl":
+        for line in fd:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield record["question"] if isinstance(record, dict) else record
+    else:
+        yield from fd
+
+
+def open_questions(input_file, input_format: Optional[str] = None):
+    """
+    return the file of questions input_file (- for stdin) opened
+    and its format, raise InvalidQuestionInputFileError if it can't be read
+
+    :param str input_format: "txt", "csv" or "jsonl",
+        default: guessed from the extension of input_file
+    """
+    if input_format is None:
+        input_format = (
+            "txt" if input_file == "-" else guess_input_format(input_file)
+        )
+    if input_format not in INPUT_FORMATS:
+        raise InvalidQuestionInputFileError(
+            input_file,
+            f"Unknown input format {input_format!r},"
+            f" choose one of {', '.join(INPUT_FORMATS)}",
+        )
     try:
-        with open(input_file, "r") as fd:
-            text = fd.read()
-            return OrderedDict.fromkeys(text.strip().split("\n")).keys()
+        fd = sys.stdin if input_file == "-" else open(input_file, "r")
     except Exception:
         message = traceback.format_exc()
         raise InvalidQuestionInputFileError(input_file, message)
+    return fd, input_format
+
+
+def _read_questions(input_file, fd, input_format, seen):
+    try:
+        try:
+            for question in _parse_questions(fd, input_format):
+                question = question.strip()
+                if not question or question in seen:
+                    continue
+                seen.add(question)
+                yield question
+        finally:
+            if fd is not sys.stdin:
+                fd.close()
+    except Exception:
+        message = traceback.format_exc()
+        raise InvalidQuestionInputFileError(input_file, message)
+
+
+def read_questions(
+    input_file,
+    input_format: Optional[str] = None,
+    bloom_filter_capacity: Optional[int] = None,
+) -> Generator[str, None, None]:
+    """
+    return a generator of the questions of input_file (- for stdin)
+    read as they are generated, skipping empty and duplicated questions.
+    The file is opened before returning, so that a missing file
+    raises InvalidQuestionInputFileError at once.
+
+    :param str input_format: "txt", "csv" or "jsonl",
+        default: guessed from the extension of input_file
+    :param int bloom_filter_capacity: remove duplicates with a bloom filter
+        of this capacity instead of a set, to bound memory
+    """
+    fd, input_format = open_questions(input_file, input_format)
+    if bloom_filter_capacity:
+        seen = BloomFilter(bloom_filter_capacity)
+    else:
+        seen = set()
+    return _read_questions(input_file, fd, input_format, seen)
 
 def write_question_answers(output_file, data):
     try:
@@ -37,35 +139,216 @@ def write_question_answers(output_file, data):
         raise FailedToWriteOuputFileError(output_file, message)
 
 
+def ends_with_newline(path):
+    """return True if the file at path is empty, missing or ends with a newline"""
+    try:
+        with open(path, "rb") as fd:
+            fd.seek(0, os.SEEK_END)
+            if fd.tell() == 0:
+                return True
+            fd.seek(-1, os.SEEK_END)
+            return fd.read(1) == b"\n"
+    except FileNotFoundError:
+        return True
+
+
+class CheckpointWriter(object):
+    """
+    Append {question: answer} records to a jsonl file,
+    written by batches of flush_every records.
+    """
+
+    def __init__(self, checkpoint_file, append=False, flush_every=FLUSH_EVERY):
+        self.checkpoint_file = checkpoint_file
+        self.flush_every = flush_every
+        self._buffer = []
+        try:
+            if append and not ends_with_newline(checkpoint_file):
+                # terminate the incomplete line of an interrupted run
+                self._buffer.append("\n")
+            self._fd = open(checkpoint_file, "a" if append else "w")
+        except Exception:
+            message = traceback.format_exc()
+            raise FailedToWriteOuputFileError(checkpoint_file, message)
+
+    def write(self, question_answer):
+        self._buffer.append(json.dumps(question_answer) + "\n")
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        try:
+            self._fd.write("".join(self._buffer))
+            self._fd.flush()
+        except Exception:
+            message = traceback.format_exc()
+            raise FailedToWriteOuputFileError(self.checkpoint_file, message)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        self._fd.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_checkpoint(checkpoint_file):
+    """
+    generate the {question: answer} records of a checkpoint file,
+    an incomplete last line, left by an interrupted run, is skipped
+    """
+    try:
+        fd = open(checkpoint_file, "r")
+    except FileNotFoundError:
+        return
+    with fd:
+        for line in fd:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def read_answered_questions(checkpoint_file):
+    answered_questions = set()
+    for question_answer in read_checkpoint(checkpoint_file):
+        answered_questions.update(question_answer)
+    return answered_questions
+
+
+def compact(checkpoint_file, output_file):
+    """write the records of checkpoint_file as one json dictionary"""
+    data = {}
+    for question_answer in read_checkpoint(checkpoint_file):
+        data.update(question_answer)
+    write_question_answers(output_file, data)
+
+
 def collect_one_question(question):
+    """return {question: answer}, None if the search failed"""
     try:
         answer = get_simple_answer(question)
         print(f"{question}: {answer}")
     except Exception:
         traceback.print_exc()
-        answer = ""
+        return None
     return {question: answer}
 
 
-def collect_data(input_file, output_file):
-    questions = read_questions(input_file)
-    data = {}
+def map_concurrently(
+    func: Callable,
+    elements: Iterable,
+    nb_workers: int = 1,
+    ordered: bool = True,
+) -> Generator:
+    """
+    generate func(element) for elements, computed by nb_workers threads.
+    At most 2 * nb_workers elements are read ahead of the results.
+
+    :param bool ordered: generate results in order of elements,
+        otherwise in order of completion
+    """
+    if nb_workers < 1:
+        raise ValueError(f"nb_workers must be positive, got {nb_workers}")
+    elements = iter(elements)
+    window = 2 * nb_workers
+    with ThreadPoolExecutor(max_workers=nb_workers) as executor:
+        pending = deque(
+            executor.submit(func, element)
+            for element in islice(elements, window)
+        )
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in completed]
+                for future in done:
+                    pending.remove(future)
+            for future in done:
+                yield future.result()
+            for element in islice(elements, len(done)):
+                pending.append(executor.submit(func, element))
+
+
+def collect_data(
+    input_file,
+    output_file,
+    nb_workers=1,
+    ordered=True,
+    checkpoint_file=None,
+    resume=False,
+    flush_every=FLUSH_EVERY,
+    compact_output=True,
+    input_format=None,
+    bloom_filter_capacity=None,
+):
+    """
+    collect answers of the questions of input_file,
+    each answer is appended to checkpoint_file as soon as it is collected,
+    which is compacted to the json dictionary output_file at the end
+
+    :param bool resume: skip the questions answered in checkpoint_file
+    :param bool compact_output: False to only write checkpoint_file
+    :param str input_format: "txt", "csv" or "jsonl", see read_questions
+    :param int bloom_filter_capacity: see read_questions
+    """
+    checkpoint_file = checkpoint_file or f"{output_file}.jsonl"
+    questions = read_questions(
+        input_file,
+        input_format=input_format,
+        bloom_filter_capacity=bloom_filter_capacity,
+    )
+    if resume:
+        answered_questions = read_answered_questions(checkpoint_file)
+        questions = (q for q in questions if q not in answered_questions)
+        print(f"Skipping {len(answered_questions)} answered questions")
 
     counter = 0
+    nb_failures = 0
 
     start_time = time.time()
-    for question in questions:
-        counter += 1
-        print(f"COLLECTING {counter}/{len(questions)}")
-        data.update(collect_one_question(question))
+    with CheckpointWriter(
+        checkpoint_file, append=resume, flush_every=flush_every
+    ) as writer:
+        for question_answer in map_concurrently(
+            collect_one_question, questions, nb_workers=nb_workers, ordered=ordered
+        ):
+            # failed questions are not checkpointed, to be retried on resume
+            if question_answer is None:
+                nb_failures += 1
+                continue
+            counter += 1
+            print(f"COLLECTED {counter}")
+            writer.write(question_answer)
     collect_time = (time.time() - start_time) / 60  #  minutes
 
-    print(f"Collected answers for {len(questions)} questions in {collect_time} minutes")
-    write_question_answers(output_file, data)
+    print(f"Collected answers for {counter} questions in {collect_time} minutes")
+    if nb_failures:
+        print(f"Failed to collect {nb_failures} questions, resume to retry them")
+    if compact_output:
+        compact(checkpoint_file, output_file)
 
 def main():
+    logging.basicConfig()
+    profiling.enable_from_env()
     args = parse_args()
-    collect_data(args.input_file, args.output_file)
+    collect_data(
+        args.input_file,
+        args.output_file,
+        nb_workers=args.workers,
+        ordered=not args.unordered,
+        checkpoint_file=args.checkpoint_file,
+        resume=args.resume,
+        flush_every=args.flush_every,
+        compact_output=not args.no_compact,
+        input_format=args.input_format,
+        bloom_filter_capacity=args.bloom_filter_capacity,
+    )
 
 if __name__ == "__main__":
     main()
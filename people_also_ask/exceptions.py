@@ -100,16 +100,24 @@ class FailedToWriteOuputFileError(RelatedQuestionError):
 class RequestError(RelatedQuestionError):
     """Exception raised when failed to request"""
 
-    def __init__(self, url, params, proxies, message):
+    def __init__(
+        self, url, params, proxies, message,
+        failure=None, status_code=None, retry_after=None,
+    ):
         self.url = url
         self.keyword = params
+        self.params = params
         self.proxies = proxies
         self.message = message
+        self.failure = failure
+        self.status_code = status_code
+        self.retry_after = retry_after
 
     def __repr__(self):
         return (
             f"Failed to requests {self.url}"
             f"\nParams = {self.params}"
             f"\nProxy = {self.proxies}"
+            f"\nFailure = {self.failure} ({self.status_code})"
             f"\nResp = {self.message}"
         )
@@ -1,160 +1,215 @@
 #! /usr/bin/env python3
+import os
 import sys
-from bs4 import BeautifulSoup
+from contextlib import closing
 from typing import List, Dict, Any, Optional, Generator
 
-from people_also_ask.parser import (
-    extract_related_questions,
-    get_featured_snippet_parser,
-)
-from people_also_ask.exceptions import (
-    RelatedQuestionParserError,
-    FeaturedSnippetParserError
-)
+from people_also_ask import metrics
+from people_also_ask.cache import get_cache, make_key
+from people_also_ask.crawler import crawl, NB_CONCURRENT_REQUESTS
+from people_also_ask.serp import SerpResult
 from people_also_ask.request import get
-from people_also_ask.request.session import user_agent
 
 
-URL = "https://www.google.com/search"
+URL_TEMPLATE = os.environ.get(
+    "PAA_GOOGLE_URL", "https://www.google.{domain}/search"
+)
+URL = URL_TEMPLATE.format(domain="com")
+
+
+def get_url(domain: str = "com") -> str:
+    """return search url of google for a domain"""
+    return URL_TEMPLATE.format(domain=domain)
+
+
+def get_search_params(keyword: str) -> Dict[str, str]:
+    """
+    return query parameters of a google search of keyword,
+    the browser ones are added by the request, to match its user agent
+    """
+    return {"q": keyword,
+            "ie": "UTF-8",
+            "oe": "UTF-8"}
 
 
-def search(keyword: str, url: str = URL) -> Optional[BeautifulSoup]:
-    """return html parser of google search result"""
-    browser = user_agent['browser']
-    params = {"client": browser,
-              "q": keyword,
-              "sourceid": browser,
-              "ie": "UTF-8",
-              "oe": "UTF-8"}
+def get_page(keyword: str, url: str = URL, use_cache: bool = True) -> str:
+    """
+    return html of google search result,
+    from the cache if it has been searched recently
 
-    response = get(url, params=params)
+    :param str keyword: text to search
+    :param str url: google search url
+    :param bool use_cache: False to bypass the cache
+    """
+    params = get_search_params(keyword)
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        key = make_key(url, params)
+        html = cache.get(key)
+        metrics.inc(
+            "paa_cache_lookups", result="miss" if html is None else "hit"
+        )
+        if html is not None:
+            return html
+    with metrics.timer("paa_search_seconds"):
+        html = get(url, params=params).text
+    if cache is not None:
+        cache.set(key, html)
+    return html
+
+
+def search(
+    keyword: str,
+    url: str = URL,
+    use_cache: bool = True,
+    backend: Optional[str] = None,
+) -> SerpResult:
+    """
+    return google search result, parsed when first needed
 
-    return BeautifulSoup(response.text, "html.parser")
+    :param str keyword: text to search
+    :param str url: google search url
+    :param bool use_cache: False to bypass the cache
+    :param str backend: name of the parser backend, default one if None
+    """
+    html = get_page(keyword, url=url, use_cache=use_cache)
+    return SerpResult(keyword, html, backend=backend)
 
 
-def _get_related_questions(text: str, domain: str="com") -> List[str]:
+def _get_related_questions(
+    text: str, domain: str="com", use_cache: bool = True
+) -> List[str]:
     """
     return a list of questions related to text.
     These questions are from search result of text
 
     :param str text: text to search
     :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
     """
 
-    url = f"https://www.google.{domain}/search"
-    document = search(text, url=url)
-    if not document:
-        return []
-    try:
-        return extract_related_questions(document)
-    except Exception:
-        raise RelatedQuestionParserError(text)
+    serp = search(text, url=get_url(domain), use_cache=use_cache)
+    return serp.related_questions
 
 
-def generate_related_questions(text: str, domain: str="com") -> Generator[str, None, None]:
+def generate_related_questions(
+    text: str,
+    domain: str="com",
+    concurrency: int = NB_CONCURRENT_REQUESTS,
+    use_cache: bool = True,
+) -> Generator[str, None, None]:
     """
     generate the questions related to text,
     these quetions are found recursively
 
     :param str text: text to search
     :param str domain: specify google domain to improve searching in a native language
+    :param int concurrency: number of questions searched at the same time
+    :param bool use_cache: False to bypass the cache of search results
     """
-    questions = set(_get_related_questions(text, domain=domain))
-    searched_text = set(text)
-    while questions:
-        text = questions.pop()
-        yield text
-        searched_text.add(text)
-        questions |= set(_get_related_questions(text, domain=domain))
-        questions -= searched_text
-
-
-def get_related_questions(text: str, max_nb_questions: Optional[int] = None, domain: str="com"):
+    with closing(crawl(
+        text,
+        fetch=lambda question: _get_related_questions(
+            question, domain=domain, use_cache=use_cache
+        ),
+        get_children=lambda questions: questions,
+        concurrency=concurrency,
+    )) as results:
+        for _, _, questions in results:
+            yield from questions
+
+
+def get_related_questions(
+    text: str,
+    max_nb_questions: Optional[int] = None,
+    domain: str="com",
+    concurrency: int = NB_CONCURRENT_REQUESTS,
+    use_cache: bool = True,
+) -> List[str]:
     """
     return a number of questions related to text.
     These questions are found recursively.
 
     :param str text: text to search
     :param str domain: specify google domain to improve searching in a native language
+    :param int concurrency: number of questions searched at the same time
+    :param bool use_cache: False to bypass the cache of search results
     """
     if max_nb_questions is None:
-        return _get_related_questions(text, domain=domain)
-    nb_question_regenerated = 0
+        return _get_related_questions(text, domain=domain, use_cache=use_cache)
     questions = []
-    for question in generate_related_questions(text, domain=domain):
-        if len(set(questions)) >= max_nb_questions:
-            break
-        questions.append(question)
-        nb_question_regenerated += 1
-
-    return list(OrderedDict.fromkeys(questions))
-    return list(questions)
-
-
-def get_answer(question: str, domain: str="com") -> Dict[str, Any]:
+    if max_nb_questions <= 0:
+        return questions
+    generator = generate_related_questions(
+        text, domain=domain, concurrency=concurrency, use_cache=use_cache
+    )
+    try:
+        for question in generator:
+            questions.append(question)
+            if len(questions) >= max_nb_questions:
+                break
+    finally:
+        generator.close()
+    return questions
+
+
+def get_answer(
+    question: str, domain: str="com", use_cache: bool = True
+) -> Dict[str, Any]:
     """
     return a dictionary as answer for a question.
 
     :param str question: asked question
     :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
     """
 
-    url = f"https://www.google.{domain}/search"
-    document = search(question, url=url)
-    related_questions = extract_related_questions(document)
-    featured_snippet = get_featured_snippet_parser(
-            question, document)
-    if not featured_snippet:
-        res = dict(
-            has_answer=False,
-            question=question,
-            related_questions=related_questions,
-        )
-    else:
-        res = dict(
-            has_answer=True,
-            question=question,
-            related_questions=related_questions,
-        )
-        try:
-            res.update(featured_snippet.to_dict())
-        except Exception:
-            raise FeaturedSnippetParserError(question)
-    return res
+    serp = search(question, url=get_url(domain), use_cache=use_cache)
+    return serp.answer
 
 
-def generate_answer(text: str, domain: str="com", enhance_search=True) -> Generator[dict, None, None]:
+def generate_answer(
+    text: str,
+    domain: str="com",
+    enhance_search=True,
+    concurrency: int = NB_CONCURRENT_REQUESTS,
+    use_cache: bool = True,
+) -> Generator[dict, None, None]:
     """
-    generate answers of questions related to text
+    generate answers of questions related to text,
+    each question is searched only once
 
     :param str text: text to search
     :param str domain: specify google domain to improve searching in a native language
+    :param bool enhance_search: search text again, up to 4 times,
+        until its answer has a link
+    :param int concurrency: number of questions searched at the same time
+    :param bool use_cache: False to bypass the cache of search results
     """
-    if enhance_search:
-        tries = 0
-        answer = {"link": False}
-    
-        while not answer["link"] and tries < 4:
-            answer = get_answer(text, domain)
+    def fetch_answer(question: str) -> Dict[str, Any]:
+        answer = get_answer(question, domain, use_cache=use_cache)
+        if question != text or not enhance_search:
+            return answer
+        tries = 1
+        while not answer.get("link") and tries < 4:
+            answer = get_answer(question, domain, use_cache=False)
             tries += 1
-    else:
-        answer = get_answer(text, domain)
-     
-    questions = set(answer["related_questions"])
-    searched_text = set(text)
-    if answer["has_answer"]:
-        yield answer
-    while questions:
-        text = questions.pop()
-        answer = get_answer(text, domain)
-        if answer["has_answer"]:
-            yield answer
-        searched_text.add(text)
-        questions |= set(get_answer(text, domain)["related_questions"])
-        questions -= searched_text
-
-
-def get_simple_answer(question: str, depth: bool = False, domain: str="com") -> str:
+        return answer
+
+    with closing(crawl(
+        text,
+        fetch=fetch_answer,
+        get_children=lambda answer: answer["related_questions"],
+        concurrency=concurrency,
+    )) as results:
+        for _, answer, _ in results:
+            if answer["has_answer"]:
+                yield answer
+
+
+def get_simple_answer(
+    question: str, depth: bool = False, domain: str="com", use_cache: bool = True
+) -> str:
     """
     return a text as summary answer for the question
 
@@ -162,19 +217,19 @@ def get_simple_answer(question: str, depth: bool = False, domain: str="com") ->
     :param bool depth: return the answer of first related question
         if no answer found for question
     :param str domain: specify google domain to improve searching in a native language
+    :param bool use_cache: False to bypass the cache of search results
     """
 
-    url = f"https://www.google.{domain}/search"
-    document = search(question, url=url)
-    featured_snippet = get_featured_snippet_parser(
-            question, document)
-    if featured_snippet:
-        return featured_snippet.response
+    serp = search(question, url=get_url(domain), use_cache=use_cache)
+    if serp.has_answer:
+        return serp.simple_answer
     if depth:
-        related_questions = get_related_questions(question)
+        related_questions = serp.related_questions
         if not related_questions:
             return ""
-        return get_simple_answer(related_questions[0], domain)
+        return get_simple_answer(
+            related_questions[0], domain=domain, use_cache=use_cache
+        )
     return ""
 
 
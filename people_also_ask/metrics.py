@@ -0,0 +1,265 @@
+#! /usr/bin/env python3
+"""
+Counters and histograms of requests, rate limiting, searches and parsing.
+
+Disabled by default, recording then costs a function call:
+
+    from people_also_ask import metrics
+
+    metrics.enable()
+    ...
+    print(metrics.export_openmetrics())
+
+or with RELATED_QUESTION_METRICS=1. Callbacks added with add_callback
+receive every recorded value, to forward them to another system.
+"""
+import os
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+ENABLED = bool(int(os.environ.get("RELATED_QUESTION_METRICS", 0)))
+
+# seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"),
+)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+# name: (type, help)
+METRICS = {
+    "paa_requests": (
+        COUNTER, "http requests sent to google, by outcome",
+    ),
+    "paa_request_seconds": (
+        HISTOGRAM, "duration of http requests, rate limiting excluded",
+    ),
+    "paa_retries": (
+        COUNTER, "requests retried, by failure",
+    ),
+    "paa_retry_wait_seconds": (
+        HISTOGRAM, "backoff waited before retrying a request",
+    ),
+    "paa_rate_limit_wait_seconds": (
+        HISTOGRAM, "time waited for the rate limiter",
+    ),
+    "paa_cache_lookups": (
+        COUNTER, "search result pages looked up in the cache, by result",
+    ),
+    "paa_search_seconds": (
+        HISTOGRAM, "duration of getting a search result page from google",
+    ),
+    "paa_parse_seconds": (
+        HISTOGRAM, "duration of each stage of parsing a page",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _make_labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram(object):
+    """Counts of values per bucket, with their sum"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        if self.buckets[-1] != float("inf"):
+            self.buckets += (float("inf"),)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[int]:
+        counts = []
+        total = 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+class Registry(object):
+    """Values of the metrics by name and labels"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.callbacks: List[Callable] = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = (name, _make_labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        for callback in self.callbacks:
+            callback(COUNTER, name, value, labels)
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _make_labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+        for callback in self.callbacks:
+            callback(HISTOGRAM, name, value, labels)
+
+    def get_counter(self, name: str, **labels) -> float:
+        return self.counters.get((name, _make_labels(labels)), 0)
+
+    def get_histogram(self, name: str, **labels) -> Optional[Histogram]:
+        return self.histograms.get((name, _make_labels(labels)))
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+REGISTRY = Registry()
+
+
+class Timer(object):
+    """Context manager observing its duration in a histogram"""
+
+    __slots__ = ("name", "labels", "start_time")
+
+    def __init__(self, name: str, labels: Dict[str, str]):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        observe(self.name, time.perf_counter() - self.start_time, **self.labels)
+
+
+class _NullTimer(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def is_enabled() -> bool:
+    return ENABLED
+
+
+def inc(name: str, value: float = 1, **labels):
+    """add value to the counter name"""
+    if ENABLED:
+        REGISTRY.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    """add value to the histogram name"""
+    if ENABLED:
+        REGISTRY.observe(name, value, **labels)
+
+
+def timer(name: str, **labels):
+    """return a context manager observing its duration in histogram name"""
+    if not ENABLED:
+        return _NULL_TIMER
+    return Timer(name, labels)
+
+
+def add_callback(callback: Callable[[str, str, float, Dict[str, str]], None]):
+    """call callback(type, name, value, labels) for every recorded value"""
+    REGISTRY.callbacks.append(callback)
+
+
+def remove_callback(callback: Callable):
+    REGISTRY.callbacks.remove(callback)
+
+
+def reset():
+    """forget the recorded values"""
+    REGISTRY.reset()
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    labels = labels + extra
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        '{}="{}"'.format(
+            key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for key, value in labels
+    ) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def export_openmetrics(registry: Registry = REGISTRY) -> str:
+    """return the recorded values in OpenMetrics text format"""
+    with registry._lock:
+        counters = sorted(registry.counters.items())
+        histograms = sorted(
+            (key, (list(h.buckets), h.cumulative_counts(), h.sum, h.count))
+            for key, h in registry.histograms.items()
+        )
+    lines = []
+    described = set()
+
+    def describe(name, kind):
+        if name in described:
+            return
+        described.add(name)
+        lines.append(f"# TYPE {name} {kind}")
+        description = METRICS.get(name)
+        if description is not None:
+            lines.append(f"# HELP {name} {description[1]}")
+
+    for (name, labels), value in counters:
+        describe(name, COUNTER)
+        lines.append(f"{name}_total{_format_labels(labels)} {value}")
+    for (name, labels), (buckets, counts, total, count) in histograms:
+        describe(name, HISTOGRAM)
+        for bound, bucket_count in zip(buckets, counts):
+            le = (("le", _format_bound(bound)),)
+            lines.append(
+                f"{name}_bucket{_format_labels(labels, le)} {bucket_count}"
+            )
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -3,12 +3,18 @@ from bs4.element import Tag
 from bs4 import BeautifulSoup
 from operator import attrgetter
 from typing import List, Optional
-from people_also_ask.tools import itemize, tabulate, remove_redundant
+from people_also_ask import profiling
+from people_also_ask.tools import (
+    itemize,
+    tabulate,
+    cached_property,
+    remove_redundant,
+)
 
 
 FEATURED_SNIPPET_ATTRIBUTES = [
     "response", "heading", "title", "link", "displayed_link",
-    "snippet_str", "snippet_data", "date", "snippet_data",
+    "snippet_str", "snippet_data", "date",
     "snippet_type", "snippet_str_body", "raw_text"
 ]
 
@@ -39,10 +45,9 @@ def get_tag_heading(tag):
 
 
 def has_youtube_link(tag):
-    youtube_links = tag.findAll(
-        lambda x: x.name == "a" and "youtube" in x.get("href", "")
+    return any(
+        "youtube" in link["href"] for link in tag.find_all("a", href=True)
     )
-    return bool(youtube_links)
 
 
 def get_raw_text(tag):
@@ -52,12 +57,17 @@ def get_raw_text(tag):
 def get_span_text(tag):
     return "\n".join(
             remove_redundant(
-                [e.text for e in tag.findAll("span") if e.text]
+                [e.text for e in tag.find_all("span") if e.text]
                 )
             )
 
 
 class FeaturedSnippetParser(object):
+    """
+    Base class of featured snippet parsers.
+    Fields extracted from the tag are cached_property,
+    so each of them is computed at most once per parser.
+    """
 
     def __init__(self, text: str, tag: Tag):
         self.text = text
@@ -68,7 +78,7 @@ class FeaturedSnippetParser(object):
             return None
         raise AttributeError(f'{self.__class__.__name__}.{attr} is invalid.')
 
-    @property
+    @cached_property
     def raw_text(self):
         return get_raw_text(self.tag)
 
@@ -78,64 +88,63 @@ class FeaturedSnippetParser(object):
         }
 
 
-class SimpleFeaturedSnippetParser(FeaturedSnippetParser):
+class LinkedFeaturedSnippetParser(FeaturedSnippetParser):
+    """Featured snippet quoting a web page"""
 
-    @classmethod
-    def get_instance(self, text, tag):
-        if tag.table is not None:
-            return TableFeaturedSnippetParser(text, tag)
-        if tag.findAll(is_ol_but_not_a_menu):
-            return OrderedFeaturedSnippetParser(text, tag)
-        if tag.ul is not None:
-            return UnorderedFeaturedSnippetParser(text, tag)
-        if get_tag_heading(tag):
-            return DefinitionFeaturedSnippetParser(text, tag)
-        if has_youtube_link(tag):
-            return YoutubeFeaturedSnippetParser(text, tag)
-
-    @property
+    @cached_property
     def tag_link(self):
-        if hasattr(self, "_tag_link"):
-            return self._tag_link
-        self._tag_link = self.tag.find(
-            lambda tag: (
-                tag.name == "a"
-                and tag.has_attr("href")
-                and tag["href"].startswith("http")
-                and (tag.h3 or tag.h2) is not None
-            )
-        )
-        return self._tag_link
+        for tag in self.tag.find_all("a", href=True):
+            if tag["href"].startswith("http") and (tag.h3 or tag.h2) is not None:
+                return tag
+        return None
 
-    @property
+    @cached_property
     def link(self):
         return self.tag_link["href"] if self.tag_link else None
 
-    @property
+    @cached_property
     def displayed_link(self):
-        return self.tag.cite.text if self.tag.cite else None
+        tag_cite = self.tag.cite
+        return tag_cite.text if tag_cite else None
 
-    @property
+    @cached_property
     def title(self):
         if self.tag_link is None:
             return None
         tag_title = self.tag_link.h3 or self.tag_link.h2
         return tag_title.text
 
-    @property
+
+class SimpleFeaturedSnippetParser(LinkedFeaturedSnippetParser):
+
+    @classmethod
+    def get_instance(self, text, tag):
+        if tag.table is not None:
+            return TableFeaturedSnippetParser(text, tag)
+        if tag.find(is_ol_but_not_a_menu):
+            return OrderedFeaturedSnippetParser(text, tag)
+        if tag.ul is not None:
+            return UnorderedFeaturedSnippetParser(text, tag)
+        if get_tag_heading(tag):
+            return DefinitionFeaturedSnippetParser(text, tag)
+        if has_youtube_link(tag):
+            return YoutubeFeaturedSnippetParser(text, tag)
+
+    @cached_property
     def heading(self):
         tag_heading = get_tag_heading(self.tag)
         return tag_heading.text
 
-    @property
+    @cached_property
     def snippet_str(self):
         lines = []
         for field in (
             "heading", "snippet_str_body",
             "displayed_link", "link", "title"
         ):
-            if getattr(self, field):
-                lines.append(getattr(self, field))
+            value = getattr(self, field)
+            if value:
+                lines.append(value)
         return "\n".join(lines)
 
     @property
@@ -162,7 +171,7 @@ class TableFeaturedSnippetParser(SimpleFeaturedSnippetParser):
     def snippet_type(self):
         return "Table Featured Snippet"
 
-    @property
+    @cached_property
     def snippet_str_body(self):
         header = self.snippet_data["columns"]
         table = self.snippet_data["values"]
@@ -172,20 +181,20 @@ class TableFeaturedSnippetParser(SimpleFeaturedSnippetParser):
     def response(self):
         return self.snippet_str_body
 
-    @property
+    @cached_property
     def snippet_data(self):
         table_tag = self.tag.find("table")
-        tr_tags = table_tag.findAll("tr")
+        tr_tags = table_tag.find_all("tr")
         if tr_tags[0].find("th"):
             columns = [
-                th_tag.text for th_tag in tr_tags[0].findAll("th")
+                th_tag.text for th_tag in tr_tags[0].find_all("th")
             ]
             body_table_tags = tr_tags[1:]
         else:
             columns = None
             body_table_tags = tr_tags
         values = [
-            [td_tag.text for td_tag in tr_tag.findAll("td")]
+            [td_tag.text for td_tag in tr_tag.find_all("td")]
             for tr_tag in body_table_tags
         ]
         if columns is None:
@@ -207,14 +216,14 @@ class OrderedFeaturedSnippetParser(SimpleFeaturedSnippetParser):
     def response(self):
         return self.snippet_str_body
 
-    @property
+    @cached_property
     def snippet_str_body(self):
         return "\n".join(itemize(self.snippet_data))
 
-    @property
+    @cached_property
     def snippet_data(self):
         ol_tags = self.tag.find("ol")
-        li_tags = ol_tags.findAll("li")
+        li_tags = ol_tags.find_all("li")
         return [tag.text for tag in li_tags]
 
 
@@ -225,7 +234,7 @@ class UnorderedFeaturedSnippetParser(SimpleFeaturedSnippetParser):
     def snippet_type(self):
         return "Unordered Featured Snippet"
 
-    @property
+    @cached_property
     def snippet_str_body(self):
         return "\n".join(itemize(self.snippet_data))
 
@@ -233,10 +242,10 @@ class UnorderedFeaturedSnippetParser(SimpleFeaturedSnippetParser):
     def response(self):
         return self.snippet_str_body
 
-    @property
+    @cached_property
     def snippet_data(self):
         ul_tag = self.tag.find("ul")
-        li_tags = ul_tag.findAll("li")
+        li_tags = ul_tag.find_all("li")
         return [tag.text for tag in li_tags]
 
 
@@ -271,7 +280,7 @@ class YoutubeFeaturedSnippetParser(SimpleFeaturedSnippetParser):
 class MultipleCardsFeaturedSnippetTag(FeaturedSnippetParser):
     """How to make a cold brew coffee"""
 
-    @property
+    @cached_property
     def heading(self):
         tag_heading = (
             self.tag.find("h3", {"role": "heading"})
@@ -287,7 +296,10 @@ class MultipleCardsFeaturedSnippetTag(FeaturedSnippetParser):
         return {
             "heading": tag_card.find("div", {"role": "heading"}).text,
             "title": tag_card.cite.text,
-            "link": tag_card.find('a', attrs={'data-jsarwt': True})['href'],
+            "link": (
+                tag_card.find('a', attrs={'data-jsarwt': True})
+                or tag_card.find('a', href=True)
+            )['href'],
             "raw_text": get_raw_text(tag_card),
         }
 
@@ -296,15 +308,15 @@ class MultipleCardsFeaturedSnippetTag(FeaturedSnippetParser):
         lines.append(f"Link: {card_data['link']}")
         return "\n".join(lines)
 
-    @property
+    @cached_property
     def snippet_str(self):
         if not self.snippet_data:
             return ""
         return "\n-------------\n".join(map(self.str_card, self.snippet_data))
 
-    @property
+    @cached_property
     def snippet_data(self):
-        return list(map(self.parse_card, self.tag.findAll("g-inner-card")))
+        return list(map(self.parse_card, self.tag.find_all("g-inner-card")))
 
     @property
     def response(self):
@@ -318,7 +330,7 @@ class SingleCardFeaturedSnippetParser(FeaturedSnippetParser):
     def snippet_type(self):
         return "Single Card FeaturedSnippet"
 
-    @property
+    @cached_property
     def heading(self):
         tag_heading = get_tag_heading(self.tag)
         return get_raw_text(tag_heading)
@@ -330,56 +342,44 @@ class SingleCardFeaturedSnippetParser(FeaturedSnippetParser):
             return heading
         return self.raw_text
 
-    @property
+    @cached_property
     def raw_text(self):
         return get_span_text(self.tag)
 
 
-class WholePageTabContainer(FeaturedSnippetParser):
+class WholePageTabContainer(LinkedFeaturedSnippetParser):
     """Gangnam Style"""
 
     @property
     def snippet_type(self):
         return "Whole Page Tab Container"
 
-    @property
-    def tag_link(self):
-        if hasattr(self, "_tag_link"):
-            return self._tag_link
-        self._tag_link = self.tag.find(
-            lambda tag: (
-                tag.name == "a"
-                and tag.has_attr("href")
-                and tag["href"].startswith("http")
-                and (tag.h3 or tag.h2) is not None
-            )
-        )
-        return self._tag_link
-
-    @property
-    def link(self):
-        return self.tag_link["href"] if self.tag_link else None
-
-    @property
-    def displayed_link(self):
-        return self.tag.cite.text if self.tag.cite else None
-
-    @property
-    def title(self):
-        if self.tag_link is None:
-            return None
-        tag_title = self.tag_link.h3 or self.tag_link.h2
-        return tag_title.text
-
     @property
     def response(self):
         return self.raw_text
 
-    @property
+    @cached_property
     def raw_text(self):
         return get_span_text(self.tag)
 
 
+SIMPLE_FEATURED_SNIPPET = "simple"
+SINGLE_CARD_FEATURED_SNIPPET = "single_card"
+MULTIPLE_CARDS_FEATURED_SNIPPET = "multiple_cards"
+WHOLE_PAGE_TABS_CONTAINER = "whole_page_tabs_container"
+WEB_RESULTS = "web_results"
+
+
+def text_startswith(tag, prefix):
+    """tag.text.startswith(prefix), joining only the first strings of tag"""
+    text = ""
+    for string in tag.strings:
+        text += string
+        if len(text) >= len(prefix):
+            break
+    return text.startswith(prefix)
+
+
 def is_simple_featured_snippet_tag(tag):
     class_tuple = tuple(tag.get("class", ""))
     is_xpdopen = (tag.name == "div" and class_tuple == ("xpdopen",))
@@ -397,7 +397,7 @@ def is_single_card_featured_snippet_tag(tag):
     )
     if not is_card_section:
         return False
-    is_card_section_of_tip = tag.text.startswith("Tip:")
+    is_card_section_of_tip = text_startswith(tag, "Tip:")
     return not is_card_section_of_tip
 
 
@@ -413,35 +413,89 @@ def is_web_results(tag):
     return (tag.name == "h2" and tag.text == "Web results")
 
 
-def get_featured_snippet_tag(document):
-
-    def lookup_featured_snippet_tag(tag):
-        return (
-            is_simple_featured_snippet_tag(tag)
-            or is_single_card_featured_snippet_tag(tag)
-            or is_multiple_card_snippet_tag(tag)
-            or is_web_results(tag)
-        )
-    whole_page_tag = document.find(is_whole_page_tabs_container)
-    tag = document.find(lookup_featured_snippet_tag)
-    if tag and is_simple_featured_snippet_tag(tag):
-        return tag
-    if whole_page_tag:
-        return whole_page_tag
-    if not tag or tag.name == "h2":
+def classify_featured_snippet_tag(tag) -> Optional[str]:
+    """
+    return the kind of featured snippet of tag, None if it is not one.
+    The name and class of tag are checked before its text.
+    """
+    name = tag.name
+    if name == "div":
+        classes = tag.get("class") or ()
+        if tuple(classes) == ("xpdopen",):
+            if is_simple_featured_snippet_tag(tag):
+                return SIMPLE_FEATURED_SNIPPET
+            return None
+        if "card-section" in classes and not text_startswith(tag, "Tip:"):
+            return SINGLE_CARD_FEATURED_SNIPPET
         return None
-    return tag
+    if name == "g-section-with-header":
+        return MULTIPLE_CARDS_FEATURED_SNIPPET
+    if name == "h2" and tag.text == "Web results":
+        return WEB_RESULTS
+    return None
+
+
+def find_featured_snippet_tag(document):
+    """
+    return the featured snippet tag of document and its kind,
+    (None, None) if there is none.
+    The document is traversed once.
+    """
+    whole_page_tag = None
+    tag = kind = None
+    for element in document.descendants:
+        if not isinstance(element, Tag):
+            continue
+        if whole_page_tag is None and element.get("id") == "wp-tabs-container":
+            whole_page_tag = element
+            if kind is not None:
+                break
+        if kind is None:
+            kind = classify_featured_snippet_tag(element)
+            if kind == SIMPLE_FEATURED_SNIPPET:
+                return element, kind
+            if kind is not None:
+                tag = element
+                if whole_page_tag is not None:
+                    break
+    if whole_page_tag is not None:
+        return whole_page_tag, (
+            classify_featured_snippet_tag(whole_page_tag)
+            or WHOLE_PAGE_TABS_CONTAINER
+        )
+    if tag is None or kind == WEB_RESULTS:
+        return None, None
+    return tag, kind
+
+
+def get_featured_snippet_tag(document):
+    return find_featured_snippet_tag(document)[0]
 
 
 def get_featured_snippet_parser(question, document: BeautifulSoup):
-    tag = get_featured_snippet_tag(document)
+    with profiling.stage(question, "featured_snippet_parser"):
+        tag, kind = find_featured_snippet_tag(document)
+        return create_featured_snippet_parser(question, tag, kind)
+
+
+FEATURED_SNIPPET_PARSERS = {
+    SIMPLE_FEATURED_SNIPPET: SimpleFeaturedSnippetParser.get_instance,
+    MULTIPLE_CARDS_FEATURED_SNIPPET: MultipleCardsFeaturedSnippetTag,
+    SINGLE_CARD_FEATURED_SNIPPET: SingleCardFeaturedSnippetParser,
+    WHOLE_PAGE_TABS_CONTAINER: WholePageTabContainer,
+}
+
+
+def create_featured_snippet_parser(
+    question, tag: Optional[Tag], kind: Optional[str] = None
+):
     if tag is None:
         return
-    if is_simple_featured_snippet_tag(tag):
-        return SimpleFeaturedSnippetParser.get_instance(question, tag)
-    if is_multiple_card_snippet_tag(tag):
-        return MultipleCardsFeaturedSnippetTag(question, tag)
-    if is_single_card_featured_snippet_tag(tag):
-        return SingleCardFeaturedSnippetParser(question, tag)
-    if is_whole_page_tabs_container(tag):
-        return WholePageTabContainer(question, tag)
+    if kind is None:
+        kind = classify_featured_snippet_tag(tag)
+    if kind is None and is_whole_page_tabs_container(tag):
+        kind = WHOLE_PAGE_TABS_CONTAINER
+    create_parser = FEATURED_SNIPPET_PARSERS.get(kind)
+    if create_parser is None:
+        return
+    return create_parser(question, tag)
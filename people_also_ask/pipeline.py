@@ -0,0 +1,158 @@
+#! /usr/bin/env python3
+"""
+Crawl of related questions where pages are fetched by threads
+and parsed by a pool of processes, to use all the cores.
+
+Parsing processes return compact results, the answer dictionary of
+SerpResult, instead of parsed documents. Pages being fetched or waiting
+for a process are bounded: fetching pauses while there are
+parse_queue_size of them.
+
+Processes are spawned, not forked, so a script crawling with the pipeline
+must guard its entry point with if __name__ == "__main__". Metrics and
+profiles of the parsing stages are recorded in the processes and lost;
+those of the fetches are recorded as usual.
+"""
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import (
+    ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from people_also_ask.serp import SerpResult
+from people_also_ask.google import get_page, get_url
+from people_also_ask.backends import get_parser_backend
+
+
+NB_FETCH_THREADS = int(os.environ.get(
+    "RELATED_QUESTION_NB_FETCH_THREADS", 8
+))
+NB_PARSE_PROCESSES = int(os.environ.get(
+    "RELATED_QUESTION_NB_PARSE_PROCESSES", os.cpu_count() or 1
+))
+
+
+def parse_page(
+    question: str, html: str, backend: Optional[str] = None
+) -> Dict[str, Any]:
+    """return the answer of a search result page, as get_answer"""
+    return SerpResult(question, html, backend=backend).answer
+
+
+def crawl_pages(
+    text: str,
+    domain: str = "com",
+    nb_fetch_threads: int = NB_FETCH_THREADS,
+    nb_parse_processes: int = NB_PARSE_PROCESSES,
+    parse_queue_size: Optional[int] = None,
+    use_cache: bool = True,
+    backend: Optional[str] = None,
+) -> Generator[Tuple[Dict[str, Any], List[str]], None, None]:
+    """
+    crawl questions from text, generate (answer, new_questions)
+    as soon as the page of each question is parsed,
+    new_questions being its related questions not discovered yet.
+    Closing the generator cancels the pages waiting for a parsing
+    process; fetches and parses already running complete and their
+    results are dropped.
+
+    :param str text: text to start from
+    :param str domain: specify google domain to improve searching in a native language
+    :param int nb_fetch_threads: number of pages fetched at the same time
+    :param int nb_parse_processes: number of pages parsed at the same time
+    :param int parse_queue_size: number of pages being fetched or waiting
+        to be parsed above which fetching pauses,
+        default: nb_fetch_threads + 2 * nb_parse_processes
+    :param bool use_cache: False to bypass the cache of search results
+    :param str backend: name of the parser backend, default one if None
+    """
+    if nb_fetch_threads < 1 or nb_parse_processes < 1:
+        raise ValueError(
+            "nb_fetch_threads and nb_parse_processes must be positive"
+        )
+    url = get_url(domain)
+    # resolved here, processes don't see set_parser_backend
+    backend = get_parser_backend(backend).name
+    parse_queue_size = (
+        parse_queue_size or nb_fetch_threads + 2 * nb_parse_processes
+    )
+    discovered = {text}
+    frontier = deque([text])
+    fetching = {}
+    parsing = {}
+    fetch_executor = ThreadPoolExecutor(max_workers=nb_fetch_threads)
+    # not forked: fetch threads may hold locks when processes start
+    parse_executor = ProcessPoolExecutor(
+        max_workers=nb_parse_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        while frontier or fetching or parsing:
+            while (
+                frontier
+                and len(fetching) < nb_fetch_threads
+                and len(fetching) + len(parsing) < parse_queue_size
+            ):
+                question = frontier.popleft()
+                future = fetch_executor.submit(
+                    get_page, question, url=url, use_cache=use_cache
+                )
+                fetching[future] = question
+            done, _ = wait(
+                list(fetching) + list(parsing), return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                if future in fetching:
+                    question = fetching.pop(future)
+                    parsing[parse_executor.submit(
+                        parse_page, question, future.result(), backend
+                    )] = question
+                    continue
+                parsing.pop(future)
+                answer = future.result()
+                new_questions = []
+                for child in answer["related_questions"]:
+                    if child not in discovered:
+                        discovered.add(child)
+                        new_questions.append(child)
+                frontier.extend(new_questions)
+                yield answer, new_questions
+    finally:
+        for future in list(fetching) + list(parsing):
+            future.cancel()
+        fetch_executor.shutdown(wait=False)
+        parse_executor.shutdown(wait=False)
+
+
+def generate_related_questions(
+    text: str, domain: str = "com", **kwargs
+) -> Generator[str, None, None]:
+    """
+    generate the questions related to text, found recursively,
+    kwargs are passed to crawl_pages
+    """
+    pages = crawl_pages(text, domain=domain, **kwargs)
+    try:
+        for _, questions in pages:
+            yield from questions
+    finally:
+        pages.close()
+
+
+def generate_answer(
+    text: str, domain: str = "com", **kwargs
+) -> Generator[dict, None, None]:
+    """
+    generate answers of questions related to text,
+    each question is searched only once,
+    kwargs are passed to crawl_pages
+    """
+    pages = crawl_pages(text, domain=domain, **kwargs)
+    try:
+        for answer, _ in pages:
+            if answer["has_answer"]:
+                yield answer
+    finally:
+        pages.close()
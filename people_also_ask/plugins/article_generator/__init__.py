@@ -1,6 +1,16 @@
-from .article_generators import generate_article
-
-
-__all__ = [
-    "generate_article"
-]
\ No newline at end of file
+from .article_generators import (
+    generate_article,
+    generate_articles,
+    load_template,
+    render_article,
+    write_articles,
+)
+
+
+__all__ = [
+    "generate_article",
+    "generate_articles",
+    "load_template",
+    "render_article",
+    "write_articles",
+]
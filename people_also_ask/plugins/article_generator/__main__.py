@@ -0,0 +1,51 @@
+#! /usr/bin/env python3
+import time
+import logging
+import argparse
+
+from people_also_ask import profiling
+from people_also_ask.data_collector import INPUT_FORMATS, read_questions
+from people_also_ask.plugins.article_generator.article_generators import (
+    NB_QUESTION,
+    NB_WORKERS,
+    TEMPLATE_PATH,
+    load_template,
+    write_articles,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog="python -m people_also_ask.plugins.article_generator"
+    )
+
+    parser.add_argument("--input-file", "-i", help="input file containing list of titles, one per line (txt), in the first column (csv) or as a string or a 'question' field (jsonl); - to read stdin", required=True)
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="format of the input file, default: guessed from its extension, txt for stdin")
+    parser.add_argument("--output-dir", "-o", default=".", help="directory where the article of each title is written as <title>-<hash>.html")
+    parser.add_argument("--template", "-t", default=str(TEMPLATE_PATH), help="jinja2 template of the articles")
+    parser.add_argument("--workers", "-w", type=int, default=NB_WORKERS, help="number of articles generated at the same time")
+    parser.add_argument("--concurrency", type=int, default=NB_QUESTION, help="number of questions searched at the same time, shared by all articles")
+    parser.add_argument("--ordered", action="store_true", help="write articles in order of titles instead of order of completion")
+
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig()
+    profiling.enable_from_env()
+    args = parse_args()
+    start_time = time.time()
+    nb_articles = write_articles(
+        read_questions(args.input_file, input_format=args.input_format),
+        output_dir=args.output_dir,
+        template=load_template(args.template),
+        nb_workers=args.workers,
+        concurrency=args.concurrency,
+        ordered=args.ordered,
+    )
+    generate_time = (time.time() - start_time) / 60  #  minutes
+    print(f"Generated {nb_articles} articles in {generate_time} minutes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,212 @@
-import people_also_ask as paa
-from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
-
-
-NB_QUESTION = 10
-
-
-def generate_article(title: str):
-    questions = paa.get_related_questions(title, max_nb_questions=NB_QUESTION)
-
-    introduction = paa.get_simple_answer(title)
-
-    contents = {}
-    for question in questions:
-        contents[question] = paa.get_simple_answer(question)
-
-    file_loader = FileSystemLoader('templates')
-    env = Environment(loader=file_loader)
-
-    cur_dir = Path(__file__).parent
-    template_path = cur_dir / "templates" / "base.html"
-    template = env.from_string(template_path.read_text())
-
-    output = template.render(
-        title=title,
-        introduction=introduction,
-        contents=contents,
-        get_question_id=lambda x: x.replace(" ", "_")
-    )
-    with open("article.html", "w") as fd:
-        fd.write(output)
\ No newline at end of file
+import os
+import re
+import hashlib
+import logging
+from pathlib import Path
+from functools import lru_cache
+from contextlib import closing
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from jinja2 import Environment, FileSystemLoader, Template
+
+from people_also_ask.crawler import crawl
+from people_also_ask.google import search
+from people_also_ask.serp import SerpResult
+from people_also_ask.data_collector import map_concurrently
+
+
+NB_QUESTION = 10
+NB_WORKERS = 4
+TEMPLATE_PATH = Path(__file__).parent / "templates" / "base.html"
+
+logger = logging.getLogger(__name__)
+
+
+def get_simple_answer(serp: SerpResult) -> str:
+    return serp.simple_answer if serp.has_answer else ""
+
+
+def get_related_questions(serp: SerpResult) -> List[str]:
+    """
+    return the related questions of serp, taken from the whole page
+    which is parsed anyway to render its answer
+    """
+    get_simple_answer(serp)
+    return serp.related_questions
+
+
+def get_question_id(question: str) -> str:
+    return question.replace(" ", "_")
+
+
+def get_article_filename(title: str) -> str:
+    """
+    return a file name of the article of title, suffixed by a hash
+    of title so that titles differing in punctuation or case don't collide
+    """
+    slug = re.sub(r"[^\w\-]+", "_", title).strip("_") or "article"
+    digest = hashlib.sha1(title.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}.html"
+
+
+@lru_cache(maxsize=None)
+def load_template(template_path=TEMPLATE_PATH) -> Template:
+    """return the compiled template at template_path, compiled only once"""
+    template_path = Path(template_path)
+    env = Environment(loader=FileSystemLoader(str(template_path.parent)))
+    return env.get_template(template_path.name)
+
+
+def search_questions(
+    title: str,
+    nb_questions: int = NB_QUESTION,
+    concurrency: int = NB_QUESTION,
+    executor: Optional[Executor] = None,
+) -> Tuple[List[str], Dict[str, SerpResult]]:
+    """
+    return the first nb_questions questions related to title
+    and the search results of title and of its questions,
+    those found while discovering the questions being reused
+
+    :param executor: run the searches in this executor
+        instead of a thread pool of their own
+    """
+    questions = []
+    serps = {}
+    with closing(crawl(
+        title,
+        fetch=search,
+        get_children=get_related_questions,
+        concurrency=concurrency,
+        executor=executor,
+    )) as results:
+        for question, serp, new_questions in results:
+            serps[question] = serp
+            questions.extend(new_questions)
+            if len(questions) >= nb_questions:
+                break
+    questions = questions[:nb_questions]
+    missing_questions = [
+        question for question in questions if question not in serps
+    ]
+    if missing_questions:
+        if executor is None:
+            with ThreadPoolExecutor(
+                max_workers=min(concurrency, len(missing_questions))
+            ) as own_executor:
+                missing_serps = list(
+                    own_executor.map(search, missing_questions)
+                )
+        else:
+            missing_serps = list(executor.map(search, missing_questions))
+        serps.update(zip(missing_questions, missing_serps))
+    return questions, serps
+
+
+def render_article(
+    title: str,
+    template: Optional[Template] = None,
+    concurrency: int = NB_QUESTION,
+    executor: Optional[Executor] = None,
+) -> str:
+    """
+    return the html article of title, answering its related questions
+
+    :param template: compiled template, default: templates/base.html
+    :param int concurrency: number of questions searched at the same time
+    :param executor: run the searches in this executor
+    """
+    questions, serps = search_questions(
+        title, NB_QUESTION, concurrency=concurrency, executor=executor
+    )
+
+    introduction = get_simple_answer(serps[title])
+
+    contents = {}
+    for question in questions:
+        contents[question] = get_simple_answer(serps[question])
+
+    template = template or load_template()
+    return template.render(
+        title=title,
+        introduction=introduction,
+        contents=contents,
+        get_question_id=get_question_id,
+    )
+
+
+def generate_article(
+    title: str,
+    concurrency: int = NB_QUESTION,
+    output_path: str = "article.html",
+):
+    output = render_article(title, concurrency=concurrency)
+    with open(output_path, "w") as fd:
+        fd.write(output)
+
+
+def generate_articles(
+    titles: Iterable[str],
+    nb_workers: int = NB_WORKERS,
+    concurrency: int = NB_QUESTION,
+    template: Optional[Template] = None,
+    ordered: bool = False,
+) -> Generator[Tuple[str, Optional[str]], None, None]:
+    """
+    generate (title, article) as soon as the article of each title is
+    rendered, article being None if it failed.
+    Searches of all the articles share one thread pool and the cache.
+
+    :param int nb_workers: number of articles generated at the same time
+    :param int concurrency: number of searches at the same time
+    :param template: compiled template, default: templates/base.html
+    :param bool ordered: generate articles in order of titles,
+        otherwise in order of completion
+    """
+    template = template or load_template()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        def render(title: str) -> Tuple[str, Optional[str]]:
+            try:
+                return title, render_article(
+                    title,
+                    template=template,
+                    concurrency=concurrency,
+                    executor=executor,
+                )
+            except Exception:
+                logger.exception("Failed to generate the article of %r", title)
+                return title, None
+
+        yield from map_concurrently(
+            render, titles, nb_workers=nb_workers, ordered=ordered
+        )
+
+
+def write_articles(
+    titles: Iterable[str],
+    output_dir: str = ".",
+    callback: Optional[Callable[[str, str], None]] = None,
+    **kwargs,
+) -> int:
+    """
+    write the article of each title to output_dir/<title>-<hash>.html
+    as soon as it is rendered, or pass it to callback(title, article),
+    return the number of articles generated
+
+    kwargs are passed to generate_articles
+    """
+    if callback is None:
+        os.makedirs(output_dir, exist_ok=True)
+    nb_articles = 0
+    for title, article in generate_articles(titles, **kwargs):
+        if article is None:
+            continue
+        if callback is None:
+            output_path = os.path.join(output_dir, get_article_filename(title))
+            with open(output_path, "w") as fd:
+                fd.write(article)
+        else:
+            callback(title, article)
+        nb_articles += 1
+    return nb_articles
@@ -0,0 +1,272 @@
+#! /usr/bin/env python3
+"""
+Opt-in profiling of the parsing of search result pages.
+
+Each parsing stage of a page (see SerpResult) runs under cProfile, and
+tracemalloc if memory is profiled. The profile of each question is
+written to OUTPUT_DIR/<question>.prof, readable with pstats or snakeviz,
+and report() aggregates the hot spots of all questions:
+
+    from people_also_ask import profiling
+
+    with profiling.profile("profiles", memory=True) as profiler:
+        ...
+    print(profiler.report())
+
+or with RELATED_QUESTION_PROFILE_DIR=profiles in the command line tools,
+which call enable_from_env and write the report to profiles/report.txt
+at exit.
+Profiled stages run one at a time, whatever the number of threads.
+"""
+import os
+import re
+import time
+import hashlib
+import atexit
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from people_also_ask.tools import tabulate
+
+
+PROFILE_DIR = os.environ.get("RELATED_QUESTION_PROFILE_DIR")
+PROFILE_MEMORY = bool(int(os.environ.get("RELATED_QUESTION_PROFILE_MEMORY", 0)))
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_profile_filename(question: str) -> str:
+    """
+    return the file name of the profile of question, suffixed by a hash
+    of question so that questions differing in punctuation or case don't collide
+    """
+    slug = re.sub(r"[^\w\-]+", "_", question).strip("_") or "query"
+    digest = hashlib.sha1(question.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}.prof"
+
+
+class Profiler(object):
+    """
+    cProfile (and tracemalloc) capture of the stages of each question.
+
+    :param str output_dir: directory of the profile of each question,
+        written by dump, nothing is written if None
+    :param bool memory: measure the peak memory of each stage
+    """
+
+    def __init__(self, output_dir: Optional[str] = None, memory: bool = False):
+        self.output_dir = output_dir
+        self.memory = memory
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.stage_times: Dict[str, List[float]] = defaultdict(list)
+        self.stage_memory: Dict[str, float] = defaultdict(float)
+        self.question_times: Dict[str, float] = defaultdict(float)
+        self.question_memory: Dict[str, float] = defaultdict(float)
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    def start(self):
+        if self.memory and not hasattr(tracemalloc, "reset_peak"):
+            raise RuntimeError("profiling memory requires python >= 3.9")
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, question: str, stage: str):
+        """profile a stage of parsing the page of question"""
+        if getattr(self._local, "depth", 0):
+            # nested in another stage, already profiled
+            yield
+            return
+        with self._lock:
+            self._local.depth = 1
+            profile = self.profiles.get(question)
+            if profile is None:
+                profile = self.profiles[question] = cProfile.Profile()
+            if self.memory:
+                tracemalloc.reset_peak()
+                start_memory = tracemalloc.get_traced_memory()[0]
+            start_time = time.perf_counter()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                duration = time.perf_counter() - start_time
+                self._local.depth = 0
+                self.stage_times[stage].append(duration)
+                self.question_times[question] += duration
+                if self.memory:
+                    peak = (tracemalloc.get_traced_memory()[1] - start_memory) / 2**20
+                    self.stage_memory[stage] = max(self.stage_memory[stage], peak)
+                    self.question_memory[question] = max(
+                        self.question_memory[question], peak
+                    )
+
+    def dump(self):
+        """write the profile of each question to output_dir"""
+        if not self.output_dir:
+            return
+        with self._lock:
+            profiles = list(self.profiles.items())
+        for question, profile in profiles:
+            profile.dump_stats(os.path.join(
+                self.output_dir, get_profile_filename(question)
+            ))
+
+    @property
+    def stats(self) -> Optional[pstats.Stats]:
+        """profiles of all the questions, aggregated"""
+        with self._lock:
+            profiles = list(self.profiles.values())
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def hot_spots(self, limit: int = 20) -> List[tuple]:
+        """
+        return (function, calls, own time, cumulative time) of the
+        functions of the package taking most time
+        """
+        stats = self.stats
+        if stats is None:
+            return []
+        rows = []
+        for (filename, line, name), (_, nb_calls, own_time, cumulative_time, _) in (
+            stats.stats.items()
+        ):
+            filename = os.path.abspath(filename)
+            if (
+                not filename.startswith(PACKAGE_DIR)
+                or filename == os.path.abspath(__file__)
+            ):
+                continue
+            function = f"{os.path.relpath(filename, PACKAGE_DIR)}:{line}({name})"
+            rows.append((function, nb_calls, own_time, cumulative_time))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:limit]
+
+    def report(self, limit: int = 20) -> str:
+        """return the time by stage, the hot spots and the slowest questions"""
+        with self._lock:
+            stage_times = {k: list(v) for k, v in self.stage_times.items()}
+            question_times = dict(self.question_times)
+        lines = [f"Profiled {len(question_times)} questions", ""]
+        stage_rows = []
+        for stage, times in sorted(stage_times.items()):
+            row = [
+                stage, len(times),
+                f"{sum(times) * 1000:.1f}",
+                f"{sum(times) / len(times) * 1000:.2f}",
+                f"{max(times) * 1000:.2f}",
+            ]
+            if self.memory:
+                row.append(f"{self.stage_memory[stage]:.2f}")
+            stage_rows.append(row)
+        header = ["stage", "calls", "total (ms)", "mean (ms)", "max (ms)"]
+        if self.memory:
+            header.append("peak (MB)")
+        lines += [tabulate(header, stage_rows), ""]
+        lines += [tabulate(
+            ["function", "calls", "own (ms)", "cumulative (ms)"],
+            [
+                [function, nb_calls, f"{own * 1000:.1f}", f"{cumulative * 1000:.1f}"]
+                for function, nb_calls, own, cumulative in self.hot_spots(limit)
+            ],
+        ), ""]
+        slowest = sorted(
+            question_times.items(), key=lambda item: item[1], reverse=True
+        )[:limit]
+        question_header = ["question", "time (ms)"]
+        if self.memory:
+            question_header.append("peak (MB)")
+        lines.append(tabulate(question_header, [
+            [question, f"{duration * 1000:.1f}"]
+            + ([f"{self.question_memory[question]:.2f}"] if self.memory else [])
+            for question, duration in slowest
+        ]))
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, path: Optional[str] = None, limit: int = 20):
+        """write report() to path, default: OUTPUT_DIR/report.txt"""
+        path = path or os.path.join(self.output_dir or ".", "report.txt")
+        with open(path, "w") as fd:
+            fd.write(self.report(limit))
+
+
+PROFILER: Optional[Profiler] = None
+
+
+def is_enabled() -> bool:
+    return PROFILER is not None
+
+
+def enable(output_dir: Optional[str] = None, memory: bool = False) -> Profiler:
+    """profile the next parsing stages, return the profiler"""
+    global PROFILER
+    disable()
+    PROFILER = Profiler(output_dir=output_dir, memory=memory)
+    PROFILER.start()
+    return PROFILER
+
+
+def disable() -> Optional[Profiler]:
+    """stop profiling and write the profiles, return the profiler"""
+    global PROFILER
+    profiler, PROFILER = PROFILER, None
+    if profiler is not None:
+        profiler.stop()
+        profiler.dump()
+    return profiler
+
+
+@contextmanager
+def profile(output_dir: Optional[str] = None, memory: bool = False):
+    """profile the parsing stages run in the block, yield the profiler"""
+    profiler = enable(output_dir=output_dir, memory=memory)
+    try:
+        yield profiler
+    finally:
+        disable()
+
+
+_NULL_STAGE = nullcontext()
+
+
+def stage(question: str, stage: str):
+    """return a context manager profiling a parsing stage of question"""
+    profiler = PROFILER
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(question, stage)
+
+
+def _write_report_at_exit():
+    profiler = disable()
+    if profiler is not None and profiler.output_dir:
+        profiler.write_report()
+
+
+def enable_from_env() -> Optional[Profiler]:
+    """
+    profile the whole run if RELATED_QUESTION_PROFILE_DIR is set,
+    writing the report at exit, return the profiler
+    """
+    if not PROFILE_DIR:
+        return None
+    profiler = enable(output_dir=PROFILE_DIR, memory=PROFILE_MEMORY)
+    atexit.register(_write_report_at_exit)
+    return profiler
@@ -1,4 +1,18 @@
-from .session import get
-
-
-__all__ = ["get", "user_agent"]
+from .session import (
+    get,
+    configure_sessions,
+    set_proxies,
+    set_rate_limit,
+    set_retry_policy,
+    set_user_agents,
+)
+
+
+__all__ = [
+    "get",
+    "configure_sessions",
+    "set_proxies",
+    "set_rate_limit",
+    "set_retry_policy",
+    "set_user_agents",
+]
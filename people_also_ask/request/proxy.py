@@ -0,0 +1,157 @@
+"""
+Pool of proxies chosen by health.
+"""
+import time
+import random
+import threading
+from typing import Dict, List, Optional, Sequence
+
+
+BASE_COOLDOWN = 30  # seconds
+MAX_COOLDOWN = 600  # seconds
+NB_FAILURES_BEFORE_EJECTION = 3
+LATENCY_SMOOTHING = 0.2
+MIN_LATENCY = 0.05  # seconds
+
+
+def normalize_proxy(proxy: str) -> str:
+    return proxy if "://" in proxy else f"http://{proxy}"
+
+
+class ProxyHealth(object):
+    """Requests statistics of a proxy"""
+
+    def __init__(self, proxy: str):
+        self.proxy = proxy
+        self.nb_requests = 0
+        self.nb_successes = 0
+        self.nb_failures = 0
+        self.nb_throttled = 0
+        self.nb_consecutive_failures = 0
+        self.nb_ejections = 0
+        self.latency = None
+        self.ejected_until = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        # smoothed, so that new proxies get a chance
+        return (self.nb_successes + 1) / (self.nb_requests + 2)
+
+    @property
+    def weight(self) -> float:
+        """share of requests the proxy should carry"""
+        latency = max(self.latency or 1.0, MIN_LATENCY)
+        return self.success_rate / latency
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def to_dict(self) -> Dict:
+        return {
+            "proxy": self.proxy,
+            "nb_requests": self.nb_requests,
+            "nb_successes": self.nb_successes,
+            "nb_failures": self.nb_failures,
+            "nb_throttled": self.nb_throttled,
+            "success_rate": self.success_rate,
+            "latency": self.latency,
+            "ejected": self.is_ejected(time.monotonic()),
+            "weight": self.weight,
+        }
+
+
+class ProxyPool(object):
+    """
+    Proxies chosen at random, weighted by success rate over latency.
+
+    A proxy is ejected when it is throttled (429 or captcha page) or after
+    NB_FAILURES_BEFORE_EJECTION consecutive failures, for a cool-down
+    doubling at each ejection, from base_cooldown up to max_cooldown.
+    """
+
+    def __init__(
+        self,
+        proxies: Optional[Sequence[str]],
+        base_cooldown: float = BASE_COOLDOWN,
+        max_cooldown: float = MAX_COOLDOWN,
+    ):
+        self.proxies = [normalize_proxy(proxy) for proxy in proxies or ()]
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self._health = {proxy: ProxyHealth(proxy) for proxy in self.proxies}
+        self._lock = threading.Lock()
+
+    def get(self, exclude: Optional[dict] = None) -> dict:
+        """
+        return the proxies argument of the next request,
+        another one than exclude when possible
+        """
+        if not self.proxies:
+            return {}
+        excluded = (exclude or {}).get("https")
+        now = time.monotonic()
+        with self._lock:
+            available = [
+                health for health in self._health.values()
+                if not health.is_ejected(now)
+            ]
+            if excluded is not None and len(available) > 1:
+                available = [
+                    health for health in available if health.proxy != excluded
+                ]
+            if available:
+                health = random.choices(
+                    available, weights=[h.weight for h in available]
+                )[0]
+            else:
+                health = min(
+                    self._health.values(), key=lambda h: h.ejected_until
+                )
+        return {"https": health.proxy}
+
+    def _get_health(self, proxies: dict) -> Optional[ProxyHealth]:
+        return self._health.get(proxies.get("https"))
+
+    def report_success(self, proxies: dict, latency: float):
+        """record a successful request through proxies"""
+        with self._lock:
+            health = self._get_health(proxies)
+            if health is None:
+                return
+            health.nb_requests += 1
+            health.nb_successes += 1
+            health.nb_consecutive_failures = 0
+            health.nb_ejections = 0
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency += LATENCY_SMOOTHING * (latency - health.latency)
+
+    def report_failure(self, proxies: dict, throttled: bool = False):
+        """record a failed request through proxies"""
+        with self._lock:
+            health = self._get_health(proxies)
+            if health is None:
+                return
+            health.nb_requests += 1
+            health.nb_failures += 1
+            health.nb_consecutive_failures += 1
+            if throttled:
+                health.nb_throttled += 1
+            if (
+                throttled
+                or health.nb_consecutive_failures >= NB_FAILURES_BEFORE_EJECTION
+            ):
+                cooldown = min(
+                    self.base_cooldown * 2 ** health.nb_ejections,
+                    self.max_cooldown,
+                )
+                health.nb_ejections += 1
+                health.nb_consecutive_failures = 0
+                health.ejected_until = time.monotonic() + cooldown
+
+    @property
+    def stats(self) -> List[Dict]:
+        """statistics of each proxy"""
+        with self._lock:
+            return [health.to_dict() for health in self._health.values()]
@@ -0,0 +1,140 @@
+"""
+Sliding-window rate limiting of the requests sent to google.
+"""
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Hashable, Optional
+
+from people_also_ask import metrics
+
+
+SCOPES = ("global", "proxy", "domain", "proxy_domain")
+
+
+class RateLimiter(object):
+    """
+    Allow at most nb_calls_limit calls in any window of duration seconds.
+
+    Each acquisition reserves the earliest allowed time slot under a lock,
+    then sleeps exactly until it; it can be used as a context manager
+    from threads or as an async context manager from coroutines.
+    """
+
+    def __init__(self, nb_calls_limit: int, duration: float):
+        if nb_calls_limit < 1:
+            raise ValueError(
+                f"nb_calls_limit must be positive, got {nb_calls_limit}"
+            )
+        self.nb_calls_limit = int(nb_calls_limit)
+        self.duration = float(duration)
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        reserve a call, return the number of seconds to wait for it,
+        None without reserving if it is more than max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            while (
+                self._timestamps
+                and self._timestamps[0] <= now - self.duration
+            ):
+                self._timestamps.popleft()
+            if len(self._timestamps) < self.nb_calls_limit:
+                slot = now
+            else:
+                slot = max(
+                    now,
+                    self._timestamps[-self.nb_calls_limit] + self.duration
+                )
+            if max_wait is not None and slot - now > max_wait:
+                return None
+            self._timestamps.append(slot)
+            return slot - now
+
+    def acquire(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        wait until a call is allowed, return the time waited,
+        None without waiting if it is more than max_wait
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return None
+        metrics.observe("paa_rate_limit_wait_seconds", wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(
+        self, max_wait: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        wait until a call is allowed, return the time waited,
+        None without waiting if it is more than max_wait
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return None
+        metrics.observe("paa_rate_limit_wait_seconds", wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class RateLimiterPool(object):
+    """
+    Rate limiters sharing the same limit, one per scope key:
+    "global" (a single limiter), "proxy", "domain" or "proxy_domain".
+    """
+
+    def __init__(self, nb_calls_limit: int, duration: float, scope: str = "proxy"):
+        if scope not in SCOPES:
+            raise ValueError(
+                f"Unknown rate limit scope {scope!r},"
+                f" choose one of {', '.join(SCOPES)}"
+            )
+        self.nb_calls_limit = int(nb_calls_limit)
+        self.duration = float(duration)
+        self.scope = scope
+        self._limiters: Dict[Hashable, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, proxy: Optional[str], domain: Optional[str]) -> Hashable:
+        if self.scope == "proxy":
+            return proxy
+        if self.scope == "domain":
+            return domain
+        if self.scope == "proxy_domain":
+            return (proxy, domain)
+        return None
+
+    def get(
+        self, proxy: Optional[str] = None, domain: Optional[str] = None
+    ) -> RateLimiter:
+        """return the rate limiter of requests to domain through proxy"""
+        key = self._key(proxy, domain)
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = RateLimiter(
+                    self.nb_calls_limit, self.duration
+                )
+            return limiter
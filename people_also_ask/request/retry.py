@@ -0,0 +1,118 @@
+"""
+Classification of failed requests and retry policy.
+"""
+import time
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from people_also_ask.exceptions import RequestError
+
+
+NETWORK_ERROR = "network_error"
+RATE_LIMITED = "rate_limited"
+CAPTCHA = "captcha"
+SERVER_ERROR = "server_error"
+CLIENT_ERROR = "client_error"
+UNKNOWN_ERROR = "unknown_error"
+
+RETRYABLE_FAILURES = frozenset((
+    NETWORK_ERROR, RATE_LIMITED, CAPTCHA, SERVER_ERROR
+))
+THROTTLED_FAILURES = frozenset((RATE_LIMITED, CAPTCHA))
+
+
+def classify_response(status_code: int, url: str, text: str = "") -> Optional[str]:
+    """return the failure of a response, None if it is successful"""
+    if "/sorry/" in url or "detected unusual traffic" in text:
+        return CAPTCHA
+    if status_code == 429:
+        return RATE_LIMITED
+    if status_code >= 500:
+        return SERVER_ERROR
+    if status_code != 200:
+        return CLIENT_ERROR
+    return None
+
+
+def classify_error(error: Exception) -> str:
+    """return the failure of an exception raised by a request"""
+    if isinstance(error, RequestError):
+        return error.failure or UNKNOWN_ERROR
+    return UNKNOWN_ERROR
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """return the seconds to wait given by a Retry-After header"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy(object):
+    """
+    Retry retryable failures up to max_attempts attempts, waiting an
+    exponential backoff with full jitter (at least Retry-After),
+    as long as the next attempt starts before deadline seconds.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        deadline: Optional[float] = 120.0,
+        retryable_failures=RETRYABLE_FAILURES,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retryable_failures = frozenset(retryable_failures)
+
+    def start(self) -> Optional[float]:
+        """return the time at which attempts must stop"""
+        if self.deadline is None:
+            return None
+        return time.monotonic() + self.deadline
+
+    def backoff(self, nb_attempts: int) -> float:
+        """return a random delay after nb_attempts failed attempts"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (nb_attempts - 1))
+        return random.uniform(0, ceiling)
+
+    def next_delay(
+        self, error: Exception, nb_attempts: int, stop_time: Optional[float]
+    ) -> Optional[float]:
+        """
+        return the delay before retrying after nb_attempts failed
+        attempts, None if error should be raised
+        """
+        if nb_attempts >= self.max_attempts:
+            return None
+        if classify_error(error) not in self.retryable_failures:
+            return None
+        delay = self.backoff(nb_attempts)
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if stop_time is not None and time.monotonic() + delay >= stop_time:
+            return None
+        return delay
+
+    def remaining(self, stop_time: Optional[float]) -> Optional[float]:
+        """return the seconds left before stop_time"""
+        if stop_time is None:
+            return None
+        return max(0.0, stop_time - time.monotonic())
@@ -1,102 +1,318 @@
-import os
-import logging
-import requests
-import traceback
-from fake_useragent import UserAgent
-
-from people_also_ask.tools import retryable
-from itertools import cycle
-from typing import Optional
-from people_also_ask.tools import CallingSemaphore
-from people_also_ask.exceptions import RequestError
-
-from requests import Session as _Session
-
-
-SESSION = _Session()
-NB_TIMES_RETRY = os.environ.get(
-    "RELATED_QUESTION_NB_TIMES_RETRY", 3
-)
-NB_REQUESTS_LIMIT = os.environ.get(
-    "RELATED_QUESTION_NB_REQUESTS_LIMIT", 25
-)
-NB_REQUESTS_DURATION_LIMIT = os.environ.get(
-    "RELATED_QUESTION_NB_REQUESTS_DURATION_LIMIT", 60  # seconds
-)
-logging.basicConfig()
-semaphore = CallingSemaphore(
-    NB_REQUESTS_LIMIT, NB_REQUESTS_DURATION_LIMIT
-)
-
-ua = UserAgent()
-user_agent = ua.getRandom
-
-HEADERS = {
-    'User-Agent': user_agent['useragent']
-}
-
-logger = logging.getLogger(__name__)
-
-
-class ProxyGeneator:
-
-    def __init__(self, proxies: Optional[tuple]):
-        self.proxies = proxies
-
-    @property
-    def iter_proxy(self):
-        if not self.proxies:
-            raise ValueError("No proxy found")
-        if getattr(self, "_iter_proxy", None) is None:
-            self._iter_proxy = cycle(self.proxies)
-        return self._iter_proxy
-
-    def get(self) -> dict:
-        if not self.proxies:
-            return {}
-        proxy = next(self.iter_proxy)
-        if not proxy.startswith("https"):
-            proxy = f"http://{proxy}"
-        return {
-            "https": proxy
-        }
-
-
-def _load_proxies() -> Optional[tuple]:
-    filepath = os.getenv("PAA_PROXY_FILE")
-    if filepath:
-        with open(filepath, "w") as fd:
-            proxies = [e.strip() for e in fd.read().splitlines() if e.strip()]
-    else:
-        proxies = None
-    return proxies
-
-
-def set_proxies(proxies: Optional[tuple]) -> ProxyGeneator:
-    global PROXY_GENERATORS
-    PROXY_GENERATORS = ProxyGeneator(proxies=proxies)
-
-
-set_proxies(proxies=_load_proxies())
-
-
-@retryable(NB_TIMES_RETRY)
-def get(url: str, params) -> requests.Response:
-    proxies = PROXY_GENERATORS.get()
-    try:
-        with semaphore:
-            response = SESSION.get(
-                url,
-                params=params,
-                headers=HEADERS,
-                proxies=proxies,
-            )
-    except Exception:
-        raise RequestError(
-            url, params, proxies, traceback.format_exc()
-        )
-    if response.status_code != 200:
-        raise RequestError(
-            url, params, proxies, response.text
-        )
-    return response
+import os
+import time
+import logging
+import requests
+import traceback
+
+from typing import List, Optional, Sequence
+from urllib.parse import urlparse
+from people_also_ask import metrics
+from people_also_ask.exceptions import RequestError
+from people_also_ask.request.proxy import ProxyPool
+from people_also_ask.request.retry import (
+    NETWORK_ERROR,
+    RATE_LIMITED,
+    THROTTLED_FAILURES,
+    RetryPolicy,
+    classify_response,
+    parse_retry_after,
+)
+from people_also_ask.request.sessions import SessionPool
+from people_also_ask.request.rate_limiter import RateLimiterPool
+from people_also_ask.request.user_agent import (
+    UserAgentRotator,
+    load_fake_user_agents,
+)
+
+
+NB_TIMES_RETRY = int(os.environ.get(
+    "RELATED_QUESTION_NB_TIMES_RETRY", 3
+))
+NB_REQUESTS_LIMIT = int(os.environ.get(
+    "RELATED_QUESTION_NB_REQUESTS_LIMIT", 25
+))
+NB_REQUESTS_DURATION_LIMIT = float(os.environ.get(
+    "RELATED_QUESTION_NB_REQUESTS_DURATION_LIMIT", 60  # seconds
+))
+# requests are limited per "proxy", "domain", "proxy_domain" or "global"
+RATE_LIMIT_SCOPE = os.environ.get(
+    "RELATED_QUESTION_RATE_LIMIT_SCOPE", "proxy"
+)
+POOL_SIZE = int(os.environ.get(
+    "RELATED_QUESTION_POOL_SIZE", 10
+))
+CONNECT_TIMEOUT = float(os.environ.get(
+    "RELATED_QUESTION_CONNECT_TIMEOUT", 10  # seconds
+))
+READ_TIMEOUT = float(os.environ.get(
+    "RELATED_QUESTION_READ_TIMEOUT", 30  # seconds
+))
+RETRY_BASE_DELAY = float(os.environ.get(
+    "RELATED_QUESTION_RETRY_BASE_DELAY", 1  # seconds
+))
+RETRY_MAX_DELAY = float(os.environ.get(
+    "RELATED_QUESTION_RETRY_MAX_DELAY", 30  # seconds
+))
+REQUEST_DEADLINE = float(os.environ.get(
+    "RELATED_QUESTION_REQUEST_DEADLINE", 120  # seconds
+))
+# user agents are rotated per "process", "proxy" or "request"
+USER_AGENT_ROTATION = os.environ.get(
+    "RELATED_QUESTION_USER_AGENT_ROTATION", "process"
+)
+# user agents are taken from the bundled list ("static")
+# or from "fake_useragent"
+USER_AGENT_SOURCE = os.environ.get(
+    "RELATED_QUESTION_USER_AGENT_SOURCE", "static"
+)
+sessions = SessionPool(
+    pool_size=POOL_SIZE,
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT,
+)
+rate_limiters = RateLimiterPool(
+    NB_REQUESTS_LIMIT, NB_REQUESTS_DURATION_LIMIT, scope=RATE_LIMIT_SCOPE
+)
+retry_policy = RetryPolicy(
+    max_attempts=NB_TIMES_RETRY,
+    base_delay=RETRY_BASE_DELAY,
+    max_delay=RETRY_MAX_DELAY,
+    deadline=REQUEST_DEADLINE,
+)
+
+user_agent_rotator = UserAgentRotator(
+    user_agents=(
+        load_fake_user_agents if USER_AGENT_SOURCE == "fake_useragent" else None
+    ),
+    rotation=USER_AGENT_ROTATION,
+)
+
+logger = logging.getLogger(__name__)
+
+# loaded from PAA_PROXY_FILE by the first request, unless set before
+PROXY_POOL: Optional[ProxyPool] = None
+
+
+def _load_proxies() -> Optional[tuple]:
+    filepath = os.getenv("PAA_PROXY_FILE")
+    if filepath:
+        with open(filepath, "r") as fd:
+            proxies = [e.strip() for e in fd.read().splitlines() if e.strip()]
+    else:
+        proxies = None
+    return proxies
+
+
+def set_proxies(proxies: Optional[tuple], **kwargs) -> ProxyPool:
+    """
+    use proxies for the next requests,
+    kwargs are passed to ProxyPool (base_cooldown, max_cooldown)
+    """
+    global PROXY_POOL
+    PROXY_POOL = ProxyPool(proxies=proxies, **kwargs)
+    return PROXY_POOL
+
+
+def get_proxy_pool() -> ProxyPool:
+    """return the proxy pool, loading PAA_PROXY_FILE at the first call"""
+    if PROXY_POOL is None:
+        return set_proxies(proxies=_load_proxies())
+    return PROXY_POOL
+
+
+def get_proxy_stats() -> List[dict]:
+    """return requests statistics of each proxy"""
+    return get_proxy_pool().stats
+
+
+def set_user_agents(
+    user_agents: Optional[Sequence[dict]] = None,
+    rotation: str = USER_AGENT_ROTATION,
+):
+    """
+    send one of user_agents, dictionaries with "useragent" and "browser",
+    (default: the bundled ones) changed once per process,
+    per proxy or per request depending on rotation
+    """
+    global user_agent_rotator
+    user_agent_rotator = UserAgentRotator(user_agents=user_agents, rotation=rotation)
+
+
+def get_user_agent(proxies: Optional[dict] = None) -> dict:
+    """return the user agent of a request through proxies"""
+    return user_agent_rotator.get((proxies or {}).get("https"))
+
+
+def get_headers(
+    proxies: Optional[dict] = None, user_agent: Optional[dict] = None
+) -> dict:
+    """return the headers of a request through proxies, sent by user_agent"""
+    user_agent = user_agent or get_user_agent(proxies)
+    return {"User-Agent": user_agent["useragent"]}
+
+
+def get_browser_params(user_agent: dict) -> dict:
+    """return the query parameters of google naming the browser of user_agent"""
+    return {"client": user_agent["browser"], "sourceid": user_agent["browser"]}
+
+
+def set_rate_limit(
+    nb_requests_limit: int = NB_REQUESTS_LIMIT,
+    duration: float = NB_REQUESTS_DURATION_LIMIT,
+    scope: str = RATE_LIMIT_SCOPE,
+):
+    """
+    allow at most nb_requests_limit requests per duration seconds
+    in each scope: "proxy", "domain", "proxy_domain" or "global"
+    """
+    global rate_limiters
+    rate_limiters = RateLimiterPool(nb_requests_limit, duration, scope=scope)
+
+
+def configure_sessions(
+    pool_size: int = POOL_SIZE,
+    connect_timeout: Optional[float] = CONNECT_TIMEOUT,
+    read_timeout: Optional[float] = READ_TIMEOUT,
+):
+    """
+    keep up to pool_size connections alive per proxy and domain,
+    give up requests which can't connect in connect_timeout seconds
+    or receive no data for read_timeout seconds (None: wait forever)
+    """
+    global sessions
+    previous_sessions = sessions
+    sessions = SessionPool(
+        pool_size=pool_size,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+    )
+    previous_sessions.close()
+
+
+def set_retry_policy(
+    nb_times_retry: int = NB_TIMES_RETRY,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+    deadline: Optional[float] = REQUEST_DEADLINE,
+):
+    """
+    try requests up to nb_times_retry times, waiting between attempts
+    a random delay up to base_delay doubled at each attempt (at most
+    max_delay) or the Retry-After of the response,
+    give up when deadline seconds have passed (None: never)
+    """
+    global retry_policy
+    retry_policy = RetryPolicy(
+        max_attempts=nb_times_retry,
+        base_delay=base_delay,
+        max_delay=max_delay,
+        deadline=deadline,
+    )
+
+
+def get_rate_limiter(url: str, proxies: dict):
+    """return the rate limiter of a request on url through proxies"""
+    return rate_limiters.get(
+        proxy=proxies.get("https"), domain=urlparse(url).netloc
+    )
+
+
+def bound_timeout(timeout, remaining: Optional[float]):
+    """return timeout shortened to the remaining seconds"""
+    if remaining is None:
+        return timeout
+    if isinstance(timeout, tuple):
+        return tuple(
+            remaining if t is None else min(t, remaining) for t in timeout
+        )
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def deadline_error(url: str, params, proxies: dict) -> RequestError:
+    """return the error of a request whose rate limit slot is after its deadline"""
+    metrics.inc("paa_requests", outcome=RATE_LIMITED)
+    return RequestError(
+        url, params, proxies,
+        "No rate limit slot before the deadline of the request",
+        failure=RATE_LIMITED,
+    )
+
+
+def _get(
+    url: str, params, proxies: dict, remaining: Optional[float] = None
+) -> requests.Response:
+    proxy_pool = get_proxy_pool()
+    session_pool = sessions
+    session = session_pool.get(
+        proxy=proxies.get("https"), domain=urlparse(url).netloc
+    )
+    # header and query parameters name the same browser
+    user_agent = get_user_agent(proxies)
+    params = {**get_browser_params(user_agent), **params}
+    stop_time = None if remaining is None else time.monotonic() + remaining
+    if get_rate_limiter(url, proxies).acquire(max_wait=remaining) is None:
+        raise deadline_error(url, params, proxies)
+    if stop_time is not None:
+        remaining = max(0.0, stop_time - time.monotonic())
+    try:
+        start_time = time.monotonic()
+        response = session.get(
+            url,
+            params=params,
+            headers=get_headers(user_agent=user_agent),
+            proxies=proxies,
+            timeout=bound_timeout(session_pool.timeout, remaining),
+        )
+    except Exception:
+        proxy_pool.report_failure(proxies)
+        metrics.inc("paa_requests", outcome=NETWORK_ERROR)
+        raise RequestError(
+            url, params, proxies, traceback.format_exc(),
+            failure=NETWORK_ERROR,
+        )
+    latency = time.monotonic() - start_time
+    failure = classify_response(
+        response.status_code, response.url, response.text
+    )
+    metrics.inc("paa_requests", outcome=failure or "ok")
+    metrics.observe("paa_request_seconds", latency, outcome=failure or "ok")
+    if failure is not None:
+        proxy_pool.report_failure(
+            proxies, throttled=failure in THROTTLED_FAILURES
+        )
+        raise RequestError(
+            url, params, proxies, response.text,
+            failure=failure,
+            status_code=response.status_code,
+            retry_after=parse_retry_after(
+                response.headers.get("Retry-After")
+            ),
+        )
+    proxy_pool.report_success(proxies, latency)
+    return response
+
+
+def get(url: str, params) -> requests.Response:
+    """
+    return a successful GET response on url,
+    retried through another proxy following retry_policy
+    """
+    policy = retry_policy
+    stop_time = policy.start()
+    proxies = None
+    nb_attempts = 0
+    while True:
+        proxies = get_proxy_pool().get(exclude=proxies)
+        try:
+            return _get(url, params, proxies, policy.remaining(stop_time))
+        except RequestError as error:
+            nb_attempts += 1
+            delay = policy.next_delay(error, nb_attempts, stop_time)
+            if delay is None:
+                raise
+            logger.debug(
+                "Retrying %s in %.2fs after %s", url, delay, error.failure
+            )
+            metrics.inc("paa_retries", failure=error.failure)
+            metrics.observe("paa_retry_wait_seconds", delay)
+            time.sleep(delay)
@@ -0,0 +1,59 @@
+"""
+Keep-alive http sessions, one per proxy and domain.
+"""
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool(object):
+    """
+    Sessions reusing their connections, one per (proxy, domain),
+    each of them keeping up to pool_size connections alive.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+    ):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._sessions: Dict[Hashable, Session] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """timeout argument of requests"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def _create_session(self) -> Session:
+        session = Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get(
+        self, proxy: Optional[str] = None, domain: Optional[str] = None
+    ) -> Session:
+        """return the session of requests to domain through proxy"""
+        key = (proxy, domain)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self._create_session()
+            return session
+
+    def close(self):
+        """close every session and its connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,128 @@
+"""
+User-Agents of the requests, chosen lazily and without network.
+"""
+import random
+import threading
+from typing import Dict, List, Optional, Sequence
+
+
+# rotate user agents once per "process", per "proxy" or per "request"
+ROTATIONS = ("process", "proxy", "request")
+
+USER_AGENTS = (
+    {
+        "useragent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            " (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+        ),
+        "browser": "Chrome",
+    },
+    {
+        "useragent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+            " (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+        ),
+        "browser": "Chrome",
+    },
+    {
+        "useragent": (
+            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+            " (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+        ),
+        "browser": "Chrome",
+    },
+    {
+        "useragent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0)"
+            " Gecko/20100101 Firefox/125.0"
+        ),
+        "browser": "Firefox",
+    },
+    {
+        "useragent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 14.4; rv:125.0)"
+            " Gecko/20100101 Firefox/125.0"
+        ),
+        "browser": "Firefox",
+    },
+    {
+        "useragent": (
+            "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:124.0)"
+            " Gecko/20100101 Firefox/124.0"
+        ),
+        "browser": "Firefox",
+    },
+    {
+        "useragent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15"
+            " (KHTML, like Gecko) Version/17.4.1 Safari/605.1.15"
+        ),
+        "browser": "Safari",
+    },
+    {
+        "useragent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            " (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+            " Edg/124.0.2478.67"
+        ),
+        "browser": "Edge",
+    },
+)
+
+
+def load_fake_user_agents(nb_user_agents: int = 50) -> List[Dict]:
+    """
+    return user agents drawn from fake_useragent,
+    which is only imported here as it is slow to load
+    """
+    try:
+        from fake_useragent import UserAgent
+    except ImportError:
+        raise ImportError(
+            "fake_useragent is not installed,"
+            " install it with `pip install people_also_ask[fake_useragent]`"
+        )
+    ua = UserAgent()
+    return [ua.getRandom for _ in range(nb_user_agents)]
+
+
+class UserAgentRotator(object):
+    """
+    User agents picked at random among user_agents,
+    once per process, proxy or request depending on rotation.
+    user_agents can be a callable, only called at the first pick.
+    """
+
+    def __init__(
+        self,
+        user_agents: Optional[Sequence[Dict]] = None,
+        rotation: str = "process",
+    ):
+        if rotation not in ROTATIONS:
+            raise ValueError(
+                f"Unknown user agent rotation {rotation!r},"
+                f" expected one of {ROTATIONS}"
+            )
+        self._user_agents = user_agents or USER_AGENTS
+        self.rotation = rotation
+        self._chosen: Dict[Optional[str], Dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def user_agents(self) -> Sequence[Dict]:
+        with self._lock:
+            if callable(self._user_agents):
+                self._user_agents = list(self._user_agents()) or USER_AGENTS
+            return self._user_agents
+
+    def get(self, proxy: Optional[str] = None) -> Dict:
+        """return the user agent of a request through proxy"""
+        user_agents = self.user_agents
+        if self.rotation == "request":
+            return random.choice(user_agents)
+        key = proxy if self.rotation == "proxy" else None
+        with self._lock:
+            user_agent = self._chosen.get(key)
+            if user_agent is None:
+                user_agent = self._chosen[key] = random.choice(user_agents)
+        return user_agent
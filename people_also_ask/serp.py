@@ -0,0 +1,129 @@
+#! /usr/bin/env python3
+"""
+Search result page, parsed once.
+"""
+from bs4.element import Tag
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional, Tuple
+
+from people_also_ask import metrics, profiling
+from people_also_ask.tools import cached_property
+from people_also_ask.backends import ParserBackend, get_parser_backend
+from people_also_ask.parser import (
+    FeaturedSnippetParser,
+    create_featured_snippet_parser,
+)
+from people_also_ask.exceptions import (
+    RelatedQuestionParserError,
+    FeaturedSnippetParserError,
+)
+
+
+def parse_document(html: str, backend: Optional[ParserBackend] = None) -> Any:
+    """return html parser of a google search result page"""
+    backend = backend or get_parser_backend()
+    return backend.parse(html)
+
+
+class SerpResult(object):
+    """
+    Google search result page of a question.
+    The page is parsed when one of its facets is first needed,
+    and each facet is extracted at most once.
+    """
+
+    def __init__(self, question: str, html: str, backend: Optional[str] = None):
+        self.question = question
+        self.html = html
+        self.backend = get_parser_backend(backend)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.question!r})"
+
+    def _stage(self, stage: str):
+        """return a context manager timing, and profiling if enabled, a stage"""
+        timer = metrics.timer(
+            "paa_parse_seconds", stage=stage, backend=self.backend.name
+        )
+        if not profiling.is_enabled():
+            return timer
+        stack = ExitStack()
+        stack.enter_context(profiling.stage(self.question, stage))
+        stack.enter_context(timer)
+        return stack
+
+    @cached_property
+    def document(self) -> Any:
+        with self._stage("parse"):
+            return parse_document(self.html, self.backend)
+
+    @cached_property
+    def related_questions(self) -> List[str]:
+        """
+        if the page has not been parsed yet, only its related questions
+        are parsed
+        """
+        try:
+            if "document" not in self.__dict__:
+                with self._stage("related_questions_only"):
+                    return self.backend.parse_related_questions(self.html)
+            document = self.document
+            with self._stage("related_questions"):
+                return self.backend.extract_related_questions(document)
+        except Exception:
+            raise RelatedQuestionParserError(self.question)
+
+    @cached_property
+    def _featured_snippet_tag_and_kind(self) -> Tuple[Optional[Tag], Optional[str]]:
+        document = self.document
+        with self._stage("featured_snippet_detection"):
+            return self.backend.find_featured_snippet_tag(document)
+
+    @property
+    def featured_snippet_tag(self) -> Optional[Tag]:
+        return self._featured_snippet_tag_and_kind[0]
+
+    @property
+    def featured_snippet_kind(self) -> Optional[str]:
+        return self._featured_snippet_tag_and_kind[1]
+
+    @cached_property
+    def featured_snippet_parser(self) -> Optional[FeaturedSnippetParser]:
+        tag, kind = self._featured_snippet_tag_and_kind
+        with self._stage("featured_snippet_parser"):
+            return create_featured_snippet_parser(self.question, tag, kind)
+
+    @cached_property
+    def featured_snippet(self) -> Optional[Dict[str, Any]]:
+        """featured snippet as a dictionary, None if there is none"""
+        if not self.featured_snippet_parser:
+            return None
+        try:
+            with self._stage("featured_snippet_extraction"):
+                return self.featured_snippet_parser.to_dict()
+        except Exception:
+            raise FeaturedSnippetParserError(self.question)
+
+    @property
+    def has_answer(self) -> bool:
+        return bool(self.featured_snippet_parser)
+
+    @cached_property
+    def answer(self) -> Dict[str, Any]:
+        """answer of the question, as returned by get_answer"""
+        has_answer = self.has_answer
+        res = dict(
+            has_answer=has_answer,
+            question=self.question,
+            related_questions=self.related_questions,
+        )
+        if has_answer:
+            res.update(self.featured_snippet)
+        return res
+
+    @cached_property
+    def simple_answer(self) -> str:
+        """text summarizing the answer, empty if there is no answer"""
+        if not self.featured_snippet_parser:
+            return ""
+        return self.featured_snippet_parser.response
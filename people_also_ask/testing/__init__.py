@@ -0,0 +1,22 @@
+"""
+Helpers to test and benchmark without google,
+imported at first use like the functions of people_also_ask.
+"""
+import importlib
+
+
+_LAZY_ATTRIBUTES = {
+    "ReplayServer": "people_also_ask.testing.replay_server",
+    "synthesize_graph": "people_also_ask.testing.replay_server",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,307 @@
+#! /usr/bin/env python3
+"""
+Local stand-in of google search serving the fixture pages,
+to measure the crawler without hitting google.
+
+    python -m people_also_ask.testing.replay_server [--port 8080] [--latency 0.1]
+
+then search it with PAA_GOOGLE_URL=http://127.0.0.1:8080/search.
+
+Questions of a graph (see synthesize_graph) are answered by a fixture page
+whose related questions are replaced by the children of the question in
+the graph, other questions by a fixture page chosen by hash.
+Latency, server errors, 429 and captcha pages can be injected at random.
+"""
+import os
+import sys
+import html
+import time
+import random
+import argparse
+import zlib
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "fixtures",
+)
+CAPTCHA_PAGE = (
+    "<html><body>Our systems have detected unusual traffic"
+    " from your computer network.</body></html>"
+)
+QUESTION_MARKER = "@@related-question-{}@@"
+
+
+def synthesize_graph(
+    nb_questions: int = 1000, nb_children: int = 4, seed: int = 0
+) -> Dict[str, List[str]]:
+    """
+    return a graph of nb_questions questions,
+    each of them related to nb_children other questions at random
+    """
+    rng = random.Random(seed)
+    questions = [f"what is question {i}?" for i in range(nb_questions)]
+    return {
+        question: rng.sample(
+            questions[:i] + questions[i + 1:], min(nb_children, nb_questions - 1)
+        )
+        for i, question in enumerate(questions)
+    }
+
+
+def read_pages(fixtures_dir: str = FIXTURES_DIR) -> List[str]:
+    """return html of the fixture pages"""
+    pages = []
+    for filename in sorted(os.listdir(fixtures_dir)):
+        if filename.endswith(".html"):
+            with open(os.path.join(fixtures_dir, filename), "r") as fd:
+                pages.append(fd.read())
+    return pages
+
+
+def make_template(page: str) -> Optional[Tuple[str, int]]:
+    """
+    return page with its related questions replaced by markers
+    and their number, None if they can't all be replaced
+    """
+    from people_also_ask.backends import get_parser_backend
+
+    backend = get_parser_backend("html.parser")
+    questions = backend.parse_related_questions(page)
+    if not questions:
+        return None
+    template = page
+    for i, question in enumerate(questions):
+        marker = QUESTION_MARKER.format(i)
+        for text in (html.escape(question), question.replace("'", "&#39;")):
+            template = template.replace(text, marker)
+    expected = [QUESTION_MARKER.format(i) for i in range(len(questions))]
+    if backend.parse_related_questions(template) != expected:
+        return None
+    return template, len(questions)
+
+
+def render_template(template: str, questions: Sequence[str]) -> str:
+    for i, question in enumerate(questions):
+        template = template.replace(
+            QUESTION_MARKER.format(i), html.escape(question)
+        )
+    return template
+
+
+class ReplayServer(object):
+    """
+    Threaded http server answering GET /search?q=question.
+
+    :param graph: related questions of each question, see synthesize_graph
+    :param float latency: seconds waited before each response
+    :param float jitter: up to jitter seconds more, at random
+    :param float error_rate: share of responses being a 503
+    :param float rate_limit_rate: share of responses being a 429
+    :param float captcha_rate: share of responses redirected to a captcha
+    :param retry_after: Retry-After header of the 429 responses
+    """
+
+    def __init__(
+        self,
+        graph: Optional[Dict[str, List[str]]] = None,
+        fixtures_dir: str = FIXTURES_DIR,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        captcha_rate: float = 0.0,
+        retry_after: Optional[int] = None,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.graph = graph or {}
+        self.pages = read_pages(fixtures_dir)
+        self.templates = {}
+        if self.graph:
+            for page in self.pages:
+                template = make_template(page)
+                if template is not None:
+                    template, nb_questions = template
+                    self.templates.setdefault(nb_questions, []).append(template)
+            missing = {
+                len(children) for children in self.graph.values()
+            } - set(self.templates)
+            if missing:
+                raise ValueError(
+                    f"No fixture page has {sorted(missing)} related questions"
+                    f", only {sorted(self.templates)}"
+                )
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.captcha_rate = captcha_rate
+        self.retry_after = retry_after
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url_template(self) -> str:
+        """search url of the server, as google.URL_TEMPLATE"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/search"
+
+    @property
+    def url(self) -> str:
+        return self.url_template
+
+    def get_page(self, question: str) -> str:
+        """return the search result page of question"""
+        key = zlib.crc32(question.encode("utf-8"))
+        children = self.graph.get(question)
+        if children is None:
+            return self.pages[key % len(self.pages)]
+        templates = self.templates[len(children)]
+        return render_template(templates[key % len(templates)], children)
+
+    def draw_outcome(self) -> str:
+        """return "captcha", "rate_limited", "error" or "ok" at random"""
+        with self._lock:
+            draw = self._random.random()
+        for outcome, rate in (
+            ("captcha", self.captcha_rate),
+            ("rate_limited", self.rate_limit_rate),
+            ("error", self.error_rate),
+        ):
+            if draw < rate:
+                return outcome
+            draw -= rate
+        return "ok"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status, body="", headers=None):
+                body = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path.startswith("/sorry/"):
+                    return self._respond(429, CAPTCHA_PAGE)
+                if url.path != "/search":
+                    return self._respond(404, "Not found")
+                question = parse_qs(url.query).get("q", [""])[0]
+                delay = server.latency
+                if server.jitter:
+                    with server._lock:
+                        delay += server._random.uniform(0, server.jitter)
+                if delay:
+                    time.sleep(delay)
+                outcome = server.draw_outcome()
+                with server._lock:
+                    server.stats[outcome] += 1
+                if outcome == "captcha":
+                    return self._respond(302, headers={
+                        "Location": f"/sorry/index?continue={url.path}",
+                    })
+                if outcome == "rate_limited":
+                    headers = {}
+                    if server.retry_after is not None:
+                        headers["Retry-After"] = str(server.retry_after)
+                    return self._respond(429, "Too Many Requests", headers)
+                if outcome == "error":
+                    return self._respond(503, "Service Unavailable")
+                self._respond(200, server.get_page(question))
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        """serve requests in a background thread"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m people_also_ask.testing.replay_server"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, default=8080, help="0 to pick a free port")
+    parser.add_argument("--nb-questions", type=int, default=0, help="serve a synthesized graph of this number of questions, 'what is question 0?' to 'what is question N-1?'")
+    parser.add_argument("--nb-children", type=int, default=4, help="related questions of each question of the graph")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds waited before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this number of seconds waited more, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="share of responses redirected to a captcha page")
+    parser.add_argument("--retry-after", type=int, help="Retry-After header of 429 responses")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    graph = None
+    if args.nb_questions:
+        graph = synthesize_graph(args.nb_questions, args.nb_children, args.seed)
+    server = ReplayServer(
+        graph=graph,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        captcha_rate=args.captcha_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    print(server.url_template, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import os
+import asyncio
+import unittest
+from unittest import mock
+from aiohttp import web
+from people_also_ask import aio, cache, google
+from people_also_ask.request.rate_limiter import RateLimiterPool
+from people_also_ask.request import session
+
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "fixtures",
+    "why_was_ho_chi_minh_a_hero.html",
+)
+
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        with open(FIXTURE, "r") as fd:
+            self.html = fd.read()
+        self.nb_in_flight = 0
+        self.max_nb_in_flight = 0
+
+        async def handle(request):
+            self.nb_in_flight += 1
+            self.max_nb_in_flight = max(
+                self.max_nb_in_flight, self.nb_in_flight
+            )
+            await asyncio.sleep(0.05)
+            self.nb_in_flight -= 1
+            return web.Response(text=self.html, content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/search", handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        patches = [
+            mock.patch.object(
+                google, "URL_TEMPLATE", f"http://127.0.0.1:{port}/search"
+            ),
+            mock.patch.object(
+                session, "rate_limiters", RateLimiterPool(1000, 60)
+            ),
+            mock.patch.object(cache, "CACHE", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def asyncTearDown(self):
+        await aio.close()
+        await self.runner.cleanup()
+
+    async def test_get_answer(self):
+        answer = await aio.get_answer("why was ho chi minh a hero")
+        self.assertTrue(answer["has_answer"])
+        self.assertEqual(
+            answer["snippet_type"], "Definition Featured Snippet"
+        )
+        self.assertTrue(answer["related_questions"])
+
+    async def test_concurrent_fetches(self):
+        answers = await asyncio.gather(*(
+            aio.get_simple_answer(f"question {i}") for i in range(20)
+        ))
+        self.assertEqual(len(answers), 20)
+        self.assertGreater(self.max_nb_in_flight, 1)
+
+    async def test_configured_sessions_are_applied(self):
+        aio.session.get_session()
+        self.addCleanup(session.configure_sessions)
+        session.configure_sessions(
+            pool_size=3, connect_timeout=1, read_timeout=2
+        )
+        http_session = aio.session.get_session()
+        self.assertEqual(http_session.timeout.sock_connect, 1)
+        self.assertEqual(http_session.timeout.sock_read, 2)
+        answers = await asyncio.gather(*(
+            aio.get_simple_answer(f"question {i}") for i in range(20)
+        ))
+        self.assertEqual(len(answers), 20)
+        # pool_size bounds kept-alive connections, not concurrency
+        self.assertGreater(self.max_nb_in_flight, 3)
+
+    async def test_generate_related_questions(self):
+        questions = await aio.get_related_questions(
+            "why was ho chi minh a hero", max_nb_questions=3
+        )
+        self.assertEqual(len(questions), 3)
+
+    async def test_related_questions_budget(self):
+        with mock.patch.object(
+            aio.google, "_get_related_questions",
+            wraps=aio.google._get_related_questions,
+        ) as get_related_questions:
+            questions = await aio.get_related_questions(
+                "why was ho chi minh a hero", max_nb_questions=1
+            )
+        self.assertEqual(len(questions), 1)
+        get_related_questions.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
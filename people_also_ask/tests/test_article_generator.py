@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from people_also_ask.serp import SerpResult
+from people_also_ask.plugins.article_generator import article_generators
+
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__), "fixtures", "how_to_make_a_cold_brew_coffee.html"
+)
+
+
+GRAPH = {
+    "tea": ["a", "h"],
+    "h": [],
+    "coffee": ["a", "b", "c"],
+    "a": ["b", "d", "e"],
+    "b": ["f"],
+    "c": [],
+    "d": ["g"],
+    "e": [],
+    "f": [],
+    "g": [],
+}
+
+
+class TestArticleGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.searched = []
+
+        def search(question):
+            if question == "broken":
+                raise ValueError(question)
+            self.searched.append(question)
+            return mock.Mock(
+                related_questions=GRAPH[question],
+                has_answer=question != "c",
+                simple_answer=f"answer of {question}",
+            )
+
+        patcher = mock.patch.object(article_generators, "search", search)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pages_are_parsed_once(self):
+        with open(FIXTURE) as fd:
+            serp = SerpResult("how to make a cold brew coffee", fd.read())
+        with mock.patch.object(
+            serp.backend, "parse_related_questions"
+        ) as parse_related_questions:
+            questions = article_generators.get_related_questions(serp)
+            article_generators.get_simple_answer(serp)
+        parse_related_questions.assert_not_called()
+        self.assertTrue(questions)
+
+    def test_search_results_are_reused(self):
+        questions, serps = article_generators.search_questions(
+            "coffee", nb_questions=5, concurrency=1
+        )
+        self.assertEqual(questions, ["a", "b", "c", "d", "e"])
+        self.assertEqual(set(serps), {"coffee", "a", "b", "c", "d", "e"})
+        self.assertEqual(sorted(self.searched), sorted(set(self.searched)))
+
+    def test_generate_article(self):
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            article_generators.generate_article("coffee", concurrency=4)
+            with open("article.html") as fd:
+                article = fd.read()
+        self.assertIn("answer of coffee", article)
+        self.assertIn("answer of g", article)
+        self.assertIn("<a></a>", article)
+        self.assertEqual(
+            sorted(self.searched), ["a", "b", "c", "coffee", "d", "e", "f", "g"]
+        )
+
+    def test_write_articles(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            nb_articles = article_generators.write_articles(
+                ["coffee", "broken", "tea"], output_dir=tmp_dir, nb_workers=2
+            )
+            filenames = sorted(os.listdir(tmp_dir))
+        self.assertEqual(nb_articles, 2)
+        self.assertEqual(filenames, sorted(
+            article_generators.get_article_filename(title)
+            for title in ["coffee", "tea"]
+        ))
+
+    def test_articles_are_streamed_to_callback(self):
+        articles = {}
+        article_generators.write_articles(
+            ["coffee", "tea"],
+            callback=articles.__setitem__,
+            ordered=True,
+            concurrency=3,
+        )
+        self.assertEqual(list(articles), ["coffee", "tea"])
+        self.assertIn("answer of h", articles["tea"])
+
+    def test_template_is_compiled_once(self):
+        self.assertIs(
+            article_generators.load_template(),
+            article_generators.load_template(),
+        )
+
+    def test_article_filename(self):
+        filename = article_generators.get_article_filename("Is coffee good?")
+        self.assertRegex(filename, r"^Is_coffee_good-[0-9a-f]{8}\.html$")
+
+    def test_article_filenames_do_not_collide(self):
+        titles = ["Is coffee good?", "Is coffee good!", "is coffee good?"]
+        self.assertEqual(
+            len({article_generators.get_article_filename(t) for t in titles}),
+            3,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+try:
+    from benchmarks import suite
+except ImportError:  # installed package, without the benchmarks
+    suite = None
+
+
+@unittest.skipIf(suite is None, "benchmarks are not available")
+class TestCompare(unittest.TestCase):
+
+    BASELINE = {
+        "html.parser/page.html/parse": {"time": 10.0, "memory": 2.0},
+        "html.parser/page.html/full": {"time": 20.0, "memory": 4.0},
+    }
+
+    def test_results_within_threshold_pass(self):
+        results = {
+            "html.parser/page.html/parse": {"time": 11.5, "memory": 2.3},
+            "html.parser/page.html/full": {"time": 15.0, "memory": 4.0},
+            # not in the baseline, not compared
+            "lxml/page.html/parse": {"time": 100.0, "memory": 50.0},
+        }
+        self.assertEqual(suite.compare(results, self.BASELINE, 0.2), [])
+
+    def test_regressions_fail(self):
+        results = {
+            "html.parser/page.html/parse": {"time": 13.0, "memory": 2.0},
+            "html.parser/page.html/full": {"time": 20.0, "memory": 5.0},
+        }
+        self.assertEqual(suite.compare(results, self.BASELINE, 0.2), [
+            ("html.parser/page.html/parse", "time", 10.0, 13.0),
+            ("html.parser/page.html/full", "memory", 4.0, 5.0),
+        ])
+
+    def test_small_deltas_are_noise(self):
+        baseline = {"a/b/parse": {"time": 0.1, "memory": 0.01}}
+        results = {"a/b/parse": {"time": 0.5, "memory": 0.05}}
+        self.assertEqual(suite.compare(results, baseline, 0.2), [])
+
+    def test_to_dict_stage_can_repeat(self):
+        stages = suite.get_stages(
+            "html.parser", "how to make a cold brew coffee",
+            suite.read_fixtures()["how_to_make_a_cold_brew_coffee.html"],
+        )
+        self.assertEqual(stages["to_dict"](), stages["to_dict"]())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import time
+import tempfile
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from people_also_ask import cache as cache_module, google
+from people_also_ask.cache import (
+    MemoryCache,
+    SQLiteCache,
+    make_key,
+    set_cache,
+    get_cache,
+)
+
+
+class TestMakeKey(unittest.TestCase):
+
+    def test_query_is_normalized(self):
+        self.assertEqual(
+            make_key("https://www.google.com/search", {"q": " Who  is Ho Chi Minh?"}),
+            make_key("https://www.google.com/search", {"q": "who is ho chi minh?"}),
+        )
+
+    def test_user_agent_params_are_ignored(self):
+        self.assertEqual(
+            make_key("url", {"q": "coffee", "client": "Chrome"}),
+            make_key("url", {"q": "coffee", "client": "Firefox"}),
+        )
+
+    def test_domain_is_part_of_key(self):
+        self.assertNotEqual(
+            make_key(google.get_url("com"), {"q": "kawa"}),
+            make_key(google.get_url("pl"), {"q": "kawa"}),
+        )
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_least_recently_used_page_is_evicted(self):
+        cache = MemoryCache(size=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats, {"hits": 2, "misses": 1})
+
+    def test_page_expires(self):
+        cache = MemoryCache(size=2, ttl=60)
+        cache.set("a", "1", ttl=0.01)
+        cache.set("b", "2")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "2")
+
+    def test_stats_are_counted_across_threads(self):
+        cache = MemoryCache(size=2)
+        cache.set("a", "1")
+
+        def get(i):
+            return cache.get("a" if i % 2 else "b")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(get, range(4000)))
+        self.assertEqual(cache.stats, {"hits": 2000, "misses": 2000})
+
+    def test_disabled_by_default(self):
+        with mock.patch.multiple(
+            cache_module, CACHE_FILE=None, CACHE_SIZE=0
+        ):
+            self.assertIsNone(cache_module._load_cache())
+
+
+class TestSQLiteCache(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite")
+
+    def test_pages_are_persisted(self):
+        cache = SQLiteCache(self.path)
+        cache.set("a", "<html>é</html>")
+        cache.close()
+        cache = SQLiteCache(self.path)
+        self.addCleanup(cache.close)
+        self.assertEqual(cache.get("a"), "<html>é</html>")
+        self.assertIsNone(cache.get("b"))
+
+    def test_page_expires(self):
+        cache = SQLiteCache(self.path, ttl=0.01)
+        self.addCleanup(cache.close)
+        cache.set("a", "1")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        cache.purge_expired()
+        self.assertEqual(len(cache), 0)
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        previous_cache = get_cache()
+        self.addCleanup(set_cache, previous_cache)
+        set_cache(MemoryCache())
+        patch = mock.patch.object(
+            google, "get", return_value=mock.Mock(text="<html></html>")
+        )
+        self.get = patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_page_is_requested_once(self):
+        google.get_page("coffee")
+        google.get_page("Coffee")
+        self.assertEqual(self.get.call_count, 1)
+
+    def test_cache_can_be_bypassed(self):
+        google.get_page("coffee")
+        google.get_page("coffee", use_cache=False)
+        self.assertEqual(self.get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
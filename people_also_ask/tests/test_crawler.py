@@ -0,0 +1,87 @@
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from people_also_ask.crawler import crawl
+
+
+GRAPH = {
+    "root": ["a", "b", "c"],
+    "a": ["b", "d", "root"],
+    "b": ["e"],
+    "c": ["a", "f"],
+    "d": [],
+    "e": ["f", "g"],
+    "f": [],
+    "g": ["root"],
+}
+
+
+class TestCrawl(unittest.TestCase):
+
+    def test_serial_crawl_is_breadth_first(self):
+        results = list(crawl("root", GRAPH.get, lambda x: x, concurrency=1))
+        self.assertEqual(
+            [question for question, _, _ in results],
+            ["root", "a", "b", "c", "d", "e", "f", "g"],
+        )
+        discovered = [q for _, _, questions in results for q in questions]
+        self.assertEqual(discovered, ["a", "b", "c", "d", "e", "f", "g"])
+
+    def test_concurrent_crawl_discovers_each_question_once(self):
+        nb_in_flight = 0
+        max_nb_in_flight = 0
+        lock = threading.Lock()
+
+        def fetch(question):
+            nonlocal nb_in_flight, max_nb_in_flight
+            with lock:
+                nb_in_flight += 1
+                max_nb_in_flight = max(max_nb_in_flight, nb_in_flight)
+            time.sleep(0.02)
+            with lock:
+                nb_in_flight -= 1
+            return GRAPH[question]
+
+        results = list(crawl("root", fetch, lambda x: x, concurrency=4))
+        discovered = [q for _, _, questions in results for q in questions]
+        self.assertEqual(sorted(discovered), ["a", "b", "c", "d", "e", "f", "g"])
+        self.assertEqual(len(results), len(GRAPH))
+        self.assertGreater(max_nb_in_flight, 1)
+        self.assertLessEqual(max_nb_in_flight, 4)
+
+    def test_closing_cancels_queued_fetches(self):
+        fetched = []
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fetch(question):
+            fetched.append(question)
+            if question == "b":
+                release.wait(5)
+            return GRAPH[question]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = crawl(
+                "root", fetch, lambda x: x, concurrency=3, executor=executor
+            )
+            self.assertEqual(next(results)[0], "root")
+            self.assertEqual(next(results)[0], "a")
+            # "b" is running or queued, "c" is queued behind it
+            results.close()
+            release.set()
+            self.assertEqual(executor.submit(len, "ok").result(), 2)
+        self.assertNotIn("c", fetched)
+
+    def test_shared_executor_is_not_shut_down(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for _ in range(2):
+                results = list(crawl(
+                    "root", GRAPH.get, lambda x: x,
+                    concurrency=2, executor=executor,
+                ))
+                self.assertEqual(len(results), len(GRAPH))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import io
+import os
+import json
+import time
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stderr
+from people_also_ask import data_collector
+from people_also_ask.tools import BloomFilter
+from people_also_ask.exceptions import InvalidQuestionInputFileError
+from people_also_ask.data_collector import (
+    collect_data,
+    read_questions,
+    map_concurrently,
+    read_checkpoint,
+)
+
+
+def slow_square(x):
+    time.sleep(0.01 * (5 - x))
+    return x * x
+
+
+class TestMapConcurrently(unittest.TestCase):
+
+    def test_ordered(self):
+        self.assertEqual(
+            list(map_concurrently(slow_square, range(5), nb_workers=5)),
+            [0, 1, 4, 9, 16],
+        )
+
+    def test_unordered(self):
+        results = list(map_concurrently(
+            slow_square, range(5), nb_workers=5, ordered=False
+        ))
+        self.assertEqual(sorted(results), [0, 1, 4, 9, 16])
+        self.assertNotEqual(results, [0, 1, 4, 9, 16])
+
+    def test_elements_are_read_lazily(self):
+        read = []
+
+        def elements():
+            for i in range(100):
+                read.append(i)
+                yield i
+
+        results = map_concurrently(slow_square, elements(), nb_workers=2)
+        next(results)
+        self.assertLessEqual(len(read), 5)
+        results.close()
+
+
+class TestReadQuestions(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, filename, text):
+        path = os.path.join(self.directory, filename)
+        with open(path, "w") as fd:
+            fd.write(text)
+        return path
+
+    def test_formats(self):
+        expected = ["where is france", "who is ho chi minh?"]
+        inputs = {
+            "questions.txt": "where is france\n\nwho is ho chi minh?\nwhere is france\n",
+            "questions.csv": 'where is france,1\n"who is ho chi minh?",2\n',
+            "questions.jsonl": (
+                '"where is france"\n{"question": "who is ho chi minh?"}\n'
+            ),
+        }
+        for filename, text in inputs.items():
+            with self.subTest(filename=filename):
+                path = self.write(filename, text)
+                self.assertEqual(list(read_questions(path)), expected)
+
+    def test_bloom_filter(self):
+        path = self.write("questions.txt", "a\nb\na\nc\nb\n")
+        self.assertEqual(
+            list(read_questions(path, bloom_filter_capacity=100)),
+            ["a", "b", "c"],
+        )
+
+    def test_invalid_input_file(self):
+        with self.assertRaises(InvalidQuestionInputFileError):
+            read_questions(os.path.join(self.directory, "missing.txt"))
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_false_positive_rate(self):
+        bloom_filter = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom_filter.add(f"question {i}")
+        self.assertTrue(all(f"question {i}" in bloom_filter for i in range(1000)))
+        false_positives = sum(
+            f"other question {i}" in bloom_filter for i in range(10000)
+        )
+        self.assertLess(false_positives, 300)
+
+
+class TestCollectData(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.input_file = os.path.join(directory.name, "questions.txt")
+        self.output_file = os.path.join(directory.name, "answers.json")
+        with open(self.input_file, "w") as fd:
+            fd.write("who is ho chi minh?\nwhere is france\nwho is ho chi minh?\n")
+        self.checkpoint_file = self.output_file + ".jsonl"
+        patch = mock.patch.object(
+            data_collector,
+            "get_simple_answer",
+            side_effect=lambda question: f"answer of {question}",
+        )
+        self.get_simple_answer = patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_collect_data(self):
+        collect_data(self.input_file, self.output_file, nb_workers=2)
+        with open(self.output_file) as fd:
+            self.assertEqual(json.load(fd), {
+                "who is ho chi minh?": "answer of who is ho chi minh?",
+                "where is france": "answer of where is france",
+            })
+
+    def test_answers_are_checkpointed(self):
+        collect_data(
+            self.input_file, self.output_file, flush_every=1,
+            compact_output=False,
+        )
+        self.assertFalse(os.path.exists(self.output_file))
+        with open(self.checkpoint_file) as fd:
+            self.assertEqual(
+                [json.loads(line) for line in fd],
+                [
+                    {"who is ho chi minh?": "answer of who is ho chi minh?"},
+                    {"where is france": "answer of where is france"},
+                ],
+            )
+
+    def test_resume(self):
+        with open(self.checkpoint_file, "w") as fd:
+            fd.write('{"who is ho chi minh?": "previous answer"}\n{"where is')
+        collect_data(self.input_file, self.output_file, resume=True)
+        self.get_simple_answer.assert_called_once_with("where is france")
+        with open(self.output_file) as fd:
+            self.assertEqual(json.load(fd), {
+                "who is ho chi minh?": "previous answer",
+                "where is france": "answer of where is france",
+            })
+
+    def test_missing_input_keeps_checkpoint(self):
+        with open(self.checkpoint_file, "w") as fd:
+            fd.write('{"who is ho chi minh?": "previous answer"}\n')
+        with self.assertRaises(InvalidQuestionInputFileError):
+            collect_data(
+                self.input_file + ".missing", self.output_file, resume=True
+            )
+        with self.assertRaises(InvalidQuestionInputFileError):
+            collect_data(self.input_file + ".missing", self.output_file)
+        self.assertEqual(
+            list(read_checkpoint(self.checkpoint_file)),
+            [{"who is ho chi minh?": "previous answer"}],
+        )
+
+    def test_failed_questions_are_retried_on_resume(self):
+        self.get_simple_answer.side_effect = RuntimeError("offline")
+        with redirect_stderr(io.StringIO()):
+            collect_data(self.input_file, self.output_file)
+        self.assertEqual(list(read_checkpoint(self.checkpoint_file)), [])
+        self.get_simple_answer.side_effect = (
+            lambda question: f"answer of {question}"
+        )
+        collect_data(self.input_file, self.output_file, resume=True)
+        with open(self.output_file) as fd:
+            self.assertEqual(len(json.load(fd)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
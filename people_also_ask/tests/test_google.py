@@ -1,4 +1,5 @@
 import pytest
+from unittest import mock
 from people_also_ask import google
 
 
@@ -23,3 +24,26 @@ def test_get_related_questions():
     )
     assert len(related_questions) > 0
 
+
+def test_generate_answer_searches_each_question_once():
+    graph = {
+        "coffee": ["a", "b"],
+        "a": ["b", "coffee"],
+        "b": ["a", "c"],
+        "c": [],
+    }
+    searched = []
+
+    def get_answer(question, domain, **kwargs):
+        searched.append(question)
+        return dict(
+            has_answer=True,
+            question=question,
+            related_questions=graph[question],
+            link="https://example.com",
+        )
+
+    with mock.patch.object(google, "get_answer", get_answer):
+        answers = list(google.generate_answer("coffee"))
+    assert [answer["question"] for answer in answers] == ["coffee", "a", "b", "c"]
+    assert sorted(searched) == ["a", "b", "c", "coffee"]
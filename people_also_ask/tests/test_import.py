@@ -0,0 +1,30 @@
+import sys
+import subprocess
+
+
+def _loaded_modules(statement):
+    output = subprocess.run(
+        [
+            sys.executable, "-c",
+            f"import sys\n{statement}\nprint(' '.join(sys.modules))",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return set(output.split())
+
+
+def test_import_is_lazy():
+    modules = _loaded_modules("import people_also_ask")
+    assert "people_also_ask.google" not in modules
+    assert "bs4" not in modules
+    assert "requests" not in modules
+
+
+def test_functions_are_imported_at_first_use():
+    modules = _loaded_modules(
+        "import people_also_ask\npeople_also_ask.get_answer"
+    )
+    assert "people_also_ask.google" in modules
+    assert "fake_useragent" not in modules
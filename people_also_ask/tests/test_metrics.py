@@ -0,0 +1,113 @@
+import os
+import unittest
+from unittest import mock
+from people_also_ask import cache, google, metrics
+from people_also_ask.serp import SerpResult
+from people_also_ask.request.rate_limiter import RateLimiter
+
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__),
+    "fixtures",
+    "why_was_ho_chi_minh_a_hero.html",
+)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        metrics.enable()
+        self.addCleanup(metrics.reset)
+        self.addCleanup(metrics.disable)
+
+    def test_disabled_metrics_are_not_recorded(self):
+        metrics.disable()
+        metrics.inc("paa_requests", outcome="ok")
+        with metrics.timer("paa_search_seconds"):
+            pass
+        self.assertEqual(metrics.REGISTRY.counters, {})
+        self.assertEqual(metrics.REGISTRY.histograms, {})
+
+    def test_counters_and_histograms(self):
+        metrics.inc("paa_requests", outcome="ok")
+        metrics.inc("paa_requests", 2, outcome="ok")
+        metrics.inc("paa_requests", outcome="captcha")
+        metrics.observe("paa_search_seconds", 0.003)
+        metrics.observe("paa_search_seconds", 100)
+        self.assertEqual(
+            metrics.REGISTRY.get_counter("paa_requests", outcome="ok"), 3
+        )
+        histogram = metrics.REGISTRY.get_histogram("paa_search_seconds")
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.sum, 100.003)
+        self.assertEqual(histogram.cumulative_counts()[-1], 2)
+
+    def test_callback(self):
+        recorded = []
+        callback = lambda *args: recorded.append(args)
+        metrics.add_callback(callback)
+        self.addCleanup(metrics.remove_callback, callback)
+        metrics.inc("paa_retries", failure="rate_limited")
+        self.assertEqual(
+            recorded,
+            [("counter", "paa_retries", 1, {"failure": "rate_limited"})],
+        )
+
+    def test_export_openmetrics(self):
+        metrics.inc("paa_requests", outcome="ok")
+        metrics.observe("paa_search_seconds", 0.02)
+        text = metrics.export_openmetrics()
+        self.assertIn("# TYPE paa_requests counter\n", text)
+        self.assertIn('paa_requests_total{outcome="ok"} 1\n', text)
+        self.assertIn("# TYPE paa_search_seconds histogram\n", text)
+        self.assertIn('paa_search_seconds_bucket{le="0.01"} 0\n', text)
+        self.assertIn('paa_search_seconds_bucket{le="0.025"} 1\n', text)
+        self.assertIn('paa_search_seconds_bucket{le="+Inf"} 1\n', text)
+        self.assertIn("paa_search_seconds_count 1\n", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+
+    def test_parse_stages(self):
+        with open(FIXTURE, "r") as fd:
+            serp = SerpResult("why was ho chi minh a hero", fd.read())
+        serp.related_questions
+        serp.answer
+        stages = {
+            dict(labels)["stage"]
+            for name, labels in metrics.REGISTRY.histograms
+            if name == "paa_parse_seconds"
+        }
+        self.assertEqual(stages, {
+            "related_questions_only",
+            "parse",
+            "featured_snippet_detection",
+            "featured_snippet_parser",
+            "featured_snippet_extraction",
+        })
+
+    def test_rate_limit_wait(self):
+        RateLimiter(10, 60).acquire()
+        histogram = metrics.REGISTRY.get_histogram(
+            "paa_rate_limit_wait_seconds"
+        )
+        self.assertEqual(histogram.count, 1)
+
+    def test_cache_lookups(self):
+        response = mock.Mock(text="<html></html>")
+        with mock.patch.object(cache, "CACHE", cache.MemoryCache()), \
+                mock.patch.object(google, "get", return_value=response):
+            google.get_page("coffee")
+            google.get_page("coffee")
+        self.assertEqual(
+            metrics.REGISTRY.get_counter("paa_cache_lookups", result="miss"), 1
+        )
+        self.assertEqual(
+            metrics.REGISTRY.get_counter("paa_cache_lookups", result="hit"), 1
+        )
+        self.assertEqual(
+            metrics.REGISTRY.get_histogram("paa_search_seconds").count, 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import os
 import unittest
 from bs4 import BeautifulSoup
+from people_also_ask.backends import BACKENDS, get_parser_backend
 from people_also_ask.parser import (
     get_featured_snippet_parser,
+    create_featured_snippet_parser,
     WholePageTabContainer,
     TableFeaturedSnippetParser,
     YoutubeFeaturedSnippetParser,
@@ -47,6 +49,43 @@ class TestParser(unittest.TestCase):
                 self.assertIsInstance(parser, Parser)
                 self.assertIsNotNone(parser.response)
 
+    def test_fields_are_computed_once(self):
+        html_file = os.path.join(
+            FIXTURES_DIR, "world_university_rankings_2019.html"
+        )
+        with open(html_file, "r") as fd:
+            document = BeautifulSoup(fd.read(), "html.parser")
+        parser = get_featured_snippet_parser("rankings", document)
+        snippet = parser.to_dict()
+        self.assertIs(parser.snippet_data, snippet["snippet_data"])
+        self.assertIs(parser.snippet_str, snippet["snippet_str"])
+        self.assertEqual(len(snippet), 11)
+
+    def test_backends(self):
+        reference = get_parser_backend("html.parser")
+        for name in BACKENDS:
+            try:
+                backend = get_parser_backend(name)
+            except ImportError:
+                continue
+            for html_filename in HTMLS_PARSER:
+                with self.subTest(backend=name, html_filename=html_filename):
+                    html_file = os.path.join(FIXTURES_DIR, html_filename)
+                    with open(html_file, "r") as fd:
+                        html = fd.read()
+                    results = []
+                    for parser_backend in (reference, backend):
+                        document = parser_backend.parse(html)
+                        parser = create_featured_snippet_parser(
+                            html_filename,
+                            parser_backend.get_featured_snippet_tag(document),
+                        )
+                        results.append((
+                            parser_backend.extract_related_questions(document),
+                            parser.to_dict(),
+                        ))
+                    self.assertEqual(results[0], results[1])
+
 
 if __name__ == "__main__":
     unittest.main()
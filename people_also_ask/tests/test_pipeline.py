@@ -0,0 +1,96 @@
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from unittest import mock
+from people_also_ask import cache, google, pipeline
+from people_also_ask.request import session
+from people_also_ask.request.rate_limiter import RateLimiterPool
+from people_also_ask.testing import ReplayServer, synthesize_graph
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = synthesize_graph(30, seed=2)
+        server = ReplayServer(graph=self.graph).start()
+        self.addCleanup(server.stop)
+        patches = [
+            mock.patch.object(google, "URL_TEMPLATE", server.url_template),
+            mock.patch.object(
+                session, "rate_limiters", RateLimiterPool(1000, 60)
+            ),
+            mock.patch.object(cache, "CACHE", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_generate_related_questions(self):
+        questions = list(pipeline.generate_related_questions(
+            "what is question 0?", nb_fetch_threads=4, nb_parse_processes=2
+        ))
+        self.assertEqual(len(questions), len(set(questions)))
+        self.assertTrue(set(questions) <= set(self.graph))
+        self.assertGreater(len(questions), 20)
+
+    def test_answers_match_search(self):
+        answers = list(islice(pipeline.generate_answer(
+            "what is question 0?",
+            nb_fetch_threads=2,
+            nb_parse_processes=2,
+            parse_queue_size=1,
+            backend="html.parser",
+        ), 5))
+        self.assertEqual(len(answers), 5)
+        for answer in answers:
+            serp = google.search(answer["question"], url=google.get_url())
+            self.assertEqual(answer, serp.answer)
+            self.assertEqual(
+                answer["related_questions"], self.graph[answer["question"]]
+            )
+
+    def test_pages_in_flight_are_bounded(self):
+        lock = threading.Lock()
+        nb_pages = 0
+        max_nb_pages = 0
+
+        def get_page(question, url, use_cache):
+            nonlocal nb_pages, max_nb_pages
+            with lock:
+                nb_pages += 1
+                max_nb_pages = max(max_nb_pages, nb_pages)
+            return question
+
+        def parse_page(question, html, backend):
+            nonlocal nb_pages
+            time.sleep(0.01)
+            with lock:
+                nb_pages -= 1
+            return {"related_questions": self.graph[question]}
+
+        with mock.patch.object(pipeline, "get_page", get_page), \
+                mock.patch.object(pipeline, "parse_page", parse_page), \
+                mock.patch.object(
+                    pipeline, "ProcessPoolExecutor",
+                    lambda max_workers, mp_context: ThreadPoolExecutor(
+                        max_workers
+                    ),
+                ):
+            pages = list(pipeline.crawl_pages(
+                "what is question 0?",
+                nb_fetch_threads=4,
+                nb_parse_processes=1,
+                parse_queue_size=3,
+            ))
+        self.assertEqual(len(pages), len(self.graph))
+        self.assertLessEqual(max_nb_pages, 3)
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            next(pipeline.crawl_pages("x", nb_parse_processes=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
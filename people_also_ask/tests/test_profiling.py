@@ -0,0 +1,83 @@
+import os
+import pstats
+import tempfile
+import unittest
+from unittest import mock
+from people_also_ask import profiling
+from people_also_ask.serp import SerpResult
+from people_also_ask.backends import get_parser_backend
+from people_also_ask.parser import get_featured_snippet_parser
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+QUESTIONS = {
+    "cheetah_vs_lion.html": "cheetah vs lion",
+    "gangnam_style.html": "gangnam style",
+}
+
+
+def read_fixture(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), "r") as fd:
+        return fd.read()
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        self.assertFalse(profiling.is_enabled())
+        with profiling.stage("question", "parse"):
+            pass
+
+    def test_profile_batch(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with profiling.profile(tmp_dir, memory=True) as profiler:
+                for filename, question in QUESTIONS.items():
+                    SerpResult(question, read_fixture(filename)).answer
+            self.assertFalse(profiling.is_enabled())
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)),
+                sorted(map(profiling.get_profile_filename, QUESTIONS.values())),
+            )
+            stats = pstats.Stats(os.path.join(
+                tmp_dir, profiling.get_profile_filename("cheetah vs lion")
+            ))
+            self.assertTrue(stats.stats)
+            profiler.write_report()
+            with open(os.path.join(tmp_dir, "report.txt")) as fd:
+                report = fd.read()
+        self.assertIn("Profiled 2 questions", report)
+        self.assertEqual(len(profiler.stage_times["parse"]), 2)
+        self.assertGreater(profiler.stage_memory["parse"], 0)
+        functions = [row[0] for row in profiler.hot_spots(limit=100)]
+        self.assertTrue(any("parser.py" in function for function in functions))
+        self.assertTrue(any("(get_instance)" in function for function in functions))
+
+    def test_nested_stages_are_profiled_once(self):
+        backend = get_parser_backend("html.parser")
+        document = backend.parse(read_fixture("cheetah_vs_lion.html"))
+        with profiling.profile() as profiler:
+            with profiler.stage("cheetah vs lion", "outer"):
+                get_featured_snippet_parser("cheetah vs lion", document)
+        self.assertEqual(list(profiler.stage_times), ["outer"])
+
+    def test_profile_filenames_do_not_collide(self):
+        questions = ["what is tea?", "what is tea!", "What is tea?"]
+        self.assertEqual(
+            len(set(map(profiling.get_profile_filename, questions))), 3
+        )
+
+    def test_enable_from_env(self):
+        self.assertIsNone(profiling.enable_from_env())
+        self.assertFalse(profiling.is_enabled())
+        with tempfile.TemporaryDirectory() as tmp_dir, mock.patch.object(
+            profiling, "PROFILE_DIR", tmp_dir
+        ), mock.patch.object(profiling.atexit, "register") as register:
+            profiler = profiling.enable_from_env()
+            self.addCleanup(profiling.disable)
+            self.assertIs(profiling.PROFILER, profiler)
+            register.assert_called_once_with(profiling._write_report_at_exit)
+            profiling.disable()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from itertools import islice
+from unittest import mock
+from people_also_ask import cache, google
+from people_also_ask.exceptions import RequestError
+from people_also_ask.request import session, retry
+from people_also_ask.request.rate_limiter import RateLimiterPool
+from people_also_ask.testing import ReplayServer, synthesize_graph
+
+
+class TestReplayServer(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = synthesize_graph(30, seed=1)
+        patches = [
+            mock.patch.object(
+                session, "rate_limiters", RateLimiterPool(1000, 60)
+            ),
+            mock.patch.object(cache, "CACHE", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(session.set_retry_policy)
+        session.set_retry_policy(nb_times_retry=1)
+
+    def serve(self, **kwargs):
+        server = ReplayServer(graph=self.graph, seed=0, **kwargs).start()
+        self.addCleanup(server.stop)
+        patch = mock.patch.object(google, "URL_TEMPLATE", server.url_template)
+        patch.start()
+        self.addCleanup(patch.stop)
+        return server
+
+    def test_synthesize_graph(self):
+        self.assertEqual(len(self.graph), 30)
+        for question, children in self.graph.items():
+            self.assertEqual(len(children), 4)
+            self.assertNotIn(question, children)
+            self.assertTrue(set(children) <= set(self.graph))
+
+    def test_pages_link_the_questions_of_the_graph(self):
+        self.serve()
+        question = "what is question 7?"
+        serp = google.search(question, url=google.get_url())
+        self.assertEqual(serp.related_questions, self.graph[question])
+        self.assertTrue(serp.has_answer)
+
+    def test_crawl(self):
+        server = self.serve()
+        questions = list(islice(
+            google.generate_related_questions(
+                "what is question 0?", concurrency=4
+            ),
+            20,
+        ))
+        self.assertEqual(len(set(questions)), 20)
+        self.assertTrue(set(questions) <= set(self.graph))
+        self.assertEqual(set(server.stats), {"ok"})
+
+    def test_rate_limits(self):
+        self.serve(rate_limit_rate=1, retry_after=3)
+        with self.assertRaises(RequestError) as context:
+            session.get(google.get_url(), {"q": "what is question 1?"})
+        self.assertEqual(context.exception.failure, retry.RATE_LIMITED)
+        self.assertEqual(context.exception.retry_after, 3)
+
+    def test_captcha(self):
+        self.serve(captcha_rate=1)
+        with self.assertRaises(RequestError) as context:
+            session.get(google.get_url(), {"q": "what is question 1?"})
+        self.assertEqual(context.exception.failure, retry.CAPTCHA)
+
+    def test_errors(self):
+        server = self.serve(error_rate=0.5)
+        for _ in range(20):
+            try:
+                session.get(google.get_url(), {"q": "what is question 1?"})
+            except RequestError as error:
+                self.assertEqual(error.failure, retry.SERVER_ERROR)
+        self.assertEqual(set(server.stats), {"ok", "error"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,347 @@
+import time
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from people_also_ask.exceptions import RequestError
+from people_also_ask.request import session, retry
+from people_also_ask.request.proxy import ProxyPool
+from people_also_ask.request.sessions import SessionPool
+from people_also_ask.request.rate_limiter import RateLimiter, RateLimiterPool
+from people_also_ask.request.user_agent import UserAgentRotator
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_calls_under_limit_do_not_wait(self):
+        limiter = RateLimiter(3, 60)
+        self.assertEqual([limiter.reserve() for _ in range(3)], [0, 0, 0])
+
+    def test_wait_is_computed_exactly(self):
+        limiter = RateLimiter(2, 10)
+        limiter.reserve()
+        limiter.reserve()
+        self.assertAlmostEqual(limiter.reserve(), 10, places=1)
+        self.assertAlmostEqual(limiter.reserve(), 10, places=1)
+        self.assertAlmostEqual(limiter.reserve(), 20, places=1)
+
+    def test_wait_above_max_wait_is_not_reserved(self):
+        limiter = RateLimiter(1, 10)
+        limiter.reserve()
+        self.assertIsNone(limiter.reserve(max_wait=5))
+        self.assertAlmostEqual(limiter.reserve(max_wait=15), 10, places=1)
+
+    def test_threads_are_not_oversubscribed(self):
+        limiter = RateLimiter(5, 0.2)
+        start = time.monotonic()
+
+        def call(_):
+            with limiter:
+                return time.monotonic() - start
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            timestamps = sorted(executor.map(call, range(15)))
+        for i in range(5, 15):
+            self.assertGreaterEqual(timestamps[i] - timestamps[i - 5], 0.19)
+        self.assertLess(timestamps[-1], 0.6)
+
+    def test_coroutines(self):
+        limiter = RateLimiter(2, 0.1)
+
+        async def call():
+            async with limiter:
+                return time.monotonic()
+
+        async def main():
+            return await asyncio.gather(*(call() for _ in range(4)))
+
+        timestamps = sorted(asyncio.run(main()))
+        self.assertGreaterEqual(timestamps[2] - timestamps[0], 0.09)
+
+
+class TestRateLimiterPool(unittest.TestCase):
+
+    def test_scopes(self):
+        pool = RateLimiterPool(1, 60, scope="proxy")
+        self.assertIs(pool.get("p1", "a.com"), pool.get("p1", "b.com"))
+        self.assertIsNot(pool.get("p1"), pool.get("p2"))
+        pool = RateLimiterPool(1, 60, scope="global")
+        self.assertIs(pool.get("p1", "a.com"), pool.get("p2", "b.com"))
+        pool = RateLimiterPool(1, 60, scope="proxy_domain")
+        self.assertIsNot(pool.get("p1", "a.com"), pool.get("p1", "b.com"))
+
+    def test_unknown_scope(self):
+        with self.assertRaises(ValueError):
+            RateLimiterPool(1, 60, scope="ip")
+
+
+class TestProxyPool(unittest.TestCase):
+
+    def test_no_proxy(self):
+        self.assertEqual(ProxyPool(None).get(), {})
+
+    def test_proxies_are_normalized(self):
+        pool = ProxyPool(["1.2.3.4:8080", "https://5.6.7.8:8080"])
+        self.assertEqual(
+            sorted(stat["proxy"] for stat in pool.stats),
+            ["http://1.2.3.4:8080", "https://5.6.7.8:8080"],
+        )
+
+    def test_throttled_proxy_is_ejected(self):
+        pool = ProxyPool(["a:1", "b:1"], base_cooldown=60)
+        pool.report_failure({"https": "http://a:1"}, throttled=True)
+        self.assertTrue(all(
+            pool.get() == {"https": "http://b:1"} for _ in range(50)
+        ))
+        stats = {stat["proxy"]: stat for stat in pool.stats}
+        self.assertTrue(stats["http://a:1"]["ejected"])
+        self.assertEqual(stats["http://a:1"]["nb_throttled"], 1)
+
+    def test_cooldown_grows_exponentially(self):
+        pool = ProxyPool(["a:1"], base_cooldown=0.05, max_cooldown=0.1)
+        proxies = {"https": "http://a:1"}
+        pool.report_failure(proxies, throttled=True)
+        self.assertTrue(pool.stats[0]["ejected"])
+        time.sleep(0.06)
+        self.assertFalse(pool.stats[0]["ejected"])
+        pool.report_failure(proxies, throttled=True)
+        time.sleep(0.06)
+        self.assertTrue(pool.stats[0]["ejected"])
+        # every proxy is ejected: the first one to come back is used
+        self.assertEqual(pool.get(), proxies)
+
+    def test_excluded_proxy_is_avoided(self):
+        pool = ProxyPool(["1.1.1.1:80", "2.2.2.2:80"])
+        for _ in range(20):
+            self.assertEqual(
+                pool.get(exclude={"https": "http://1.1.1.1:80"}),
+                {"https": "http://2.2.2.2:80"},
+            )
+        single = ProxyPool(["1.1.1.1:80"])
+        self.assertEqual(
+            single.get(exclude={"https": "http://1.1.1.1:80"}),
+            {"https": "http://1.1.1.1:80"},
+        )
+
+    def test_healthy_proxies_carry_more_requests(self):
+        pool = ProxyPool(["fast:1", "slow:1"])
+        for _ in range(10):
+            pool.report_success({"https": "http://fast:1"}, 0.1)
+            pool.report_success({"https": "http://slow:1"}, 1.0)
+        counts = {"http://fast:1": 0, "http://slow:1": 0}
+        for _ in range(1000):
+            counts[pool.get()["https"]] += 1
+        self.assertGreater(counts["http://fast:1"], 3 * counts["http://slow:1"])
+
+
+class TestSessionPool(unittest.TestCase):
+
+    def test_one_session_per_proxy_and_domain(self):
+        pool = SessionPool(pool_size=32)
+        self.addCleanup(pool.close)
+        self.assertIs(pool.get("p1", "a.com"), pool.get("p1", "a.com"))
+        self.assertIsNot(pool.get("p1", "a.com"), pool.get("p2", "a.com"))
+        self.assertIsNot(pool.get("p1", "a.com"), pool.get("p1", "b.com"))
+        adapter = pool.get("p1", "a.com").get_adapter("https://a.com")
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    def test_requests_have_timeouts(self):
+        self.addCleanup(session.configure_sessions)
+        session.configure_sessions(connect_timeout=1, read_timeout=2)
+        response = mock.Mock(
+            status_code=200, url="https://www.google.com/search", text=""
+        )
+        with mock.patch.object(
+            session.sessions.get(None, "www.google.com"),
+            "get",
+            return_value=response,
+        ) as get:
+            session.get("https://www.google.com/search", params={"q": "x"})
+        self.assertEqual(get.call_args.kwargs["timeout"], (1, 2))
+
+
+USER_AGENTS = [
+    {"useragent": f"agent {i}", "browser": "Chrome"} for i in range(20)
+]
+
+
+class TestUserAgentRotator(unittest.TestCase):
+
+    def test_process_rotation(self):
+        rotator = UserAgentRotator(USER_AGENTS, rotation="process")
+        self.assertEqual(
+            len({rotator.get(f"proxy {i}")["useragent"] for i in range(20)}),
+            1,
+        )
+
+    def test_proxy_rotation(self):
+        rotator = UserAgentRotator(USER_AGENTS, rotation="proxy")
+        self.assertEqual(rotator.get("a"), rotator.get("a"))
+        self.assertGreater(
+            len({rotator.get(f"proxy {i}")["useragent"] for i in range(50)}),
+            1,
+        )
+
+    def test_request_rotation(self):
+        rotator = UserAgentRotator(USER_AGENTS, rotation="request")
+        self.assertGreater(
+            len({rotator.get()["useragent"] for _ in range(50)}), 1
+        )
+
+    def test_user_agents_are_loaded_lazily(self):
+        load = mock.Mock(return_value=USER_AGENTS[:1])
+        rotator = UserAgentRotator(load)
+        load.assert_not_called()
+        self.assertEqual(rotator.get(), USER_AGENTS[0])
+        self.assertEqual(rotator.get(), USER_AGENTS[0])
+        load.assert_called_once_with()
+
+    def test_unknown_rotation(self):
+        with self.assertRaises(ValueError):
+            UserAgentRotator(rotation="hourly")
+
+    def test_headers(self):
+        self.addCleanup(session.set_user_agents)
+        session.set_user_agents(USER_AGENTS[:1])
+        self.assertEqual(session.get_headers(), {"User-Agent": "agent 0"})
+
+    def test_params_match_header(self):
+        self.addCleanup(session.set_user_agents)
+        session.set_user_agents([
+            {"useragent": f"agent {i}", "browser": f"browser {i}"}
+            for i in range(20)
+        ], rotation="request")
+        get = mock.Mock(return_value=_response(200))
+        with mock.patch.object(
+            session.sessions, "get", return_value=mock.Mock(get=get)
+        ):
+            for _ in range(10):
+                session._get("https://www.google.com/search", {"q": "x"}, {})
+        for call in get.call_args_list:
+            agent = call.kwargs["headers"]["User-Agent"]
+            browser = agent.replace("agent", "browser")
+            self.assertEqual(call.kwargs["params"]["client"], browser)
+            self.assertEqual(call.kwargs["params"]["sourceid"], browser)
+            self.assertEqual(call.kwargs["params"]["q"], "x")
+
+
+def _response(status_code, url="https://www.google.com/search", headers=None):
+    return mock.Mock(
+        status_code=status_code, url=url, text="", headers=headers or {}
+    )
+
+
+class TestRetry(unittest.TestCase):
+
+    def test_classify_response(self):
+        self.assertIsNone(retry.classify_response(200, "https://g.com/search"))
+        self.assertEqual(
+            retry.classify_response(429, "https://g.com/search"),
+            retry.RATE_LIMITED,
+        )
+        self.assertEqual(
+            retry.classify_response(200, "https://g.com/sorry/index"),
+            retry.CAPTCHA,
+        )
+        self.assertEqual(
+            retry.classify_response(503, "https://g.com/search"),
+            retry.SERVER_ERROR,
+        )
+        self.assertEqual(
+            retry.classify_response(404, "https://g.com/search"),
+            retry.CLIENT_ERROR,
+        )
+
+    def test_parse_retry_after(self):
+        self.assertEqual(retry.parse_retry_after("120"), 120)
+        self.assertIsNone(retry.parse_retry_after(None))
+        self.assertIsNone(retry.parse_retry_after("soon"))
+        self.assertEqual(
+            retry.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0
+        )
+
+    def test_backoff_is_bounded(self):
+        policy = retry.RetryPolicy(base_delay=1, max_delay=5)
+        for nb_attempts in range(1, 10):
+            delay = policy.backoff(nb_attempts)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(5, 2 ** (nb_attempts - 1)))
+
+    def test_next_delay(self):
+        policy = retry.RetryPolicy(max_attempts=3, base_delay=0, deadline=10)
+        stop_time = policy.start()
+        throttled = RequestError(
+            "url", {}, {}, "", failure=retry.RATE_LIMITED, retry_after=2
+        )
+        self.assertEqual(policy.next_delay(throttled, 1, stop_time), 2)
+        self.assertIsNone(policy.next_delay(throttled, 3, stop_time))
+        not_found = RequestError("url", {}, {}, "", failure=retry.CLIENT_ERROR)
+        self.assertIsNone(policy.next_delay(not_found, 1, stop_time))
+        late = RequestError(
+            "url", {}, {}, "", failure=retry.RATE_LIMITED, retry_after=60
+        )
+        self.assertIsNone(policy.next_delay(late, 1, stop_time))
+
+
+class TestGet(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(session.set_retry_policy)
+        self.addCleanup(session.set_proxies, None)
+        session.set_retry_policy(nb_times_retry=3, base_delay=0)
+        session.set_proxies(["1.1.1.1:80", "2.2.2.2:80"])
+
+    def _get(self, responses):
+        requests = []
+
+        def fake_get(url, **kwargs):
+            requests.append(kwargs["proxies"]["https"])
+            return responses.pop(0)
+
+        with mock.patch.object(
+            session.sessions, "get",
+            return_value=mock.Mock(get=mock.Mock(side_effect=fake_get)),
+        ), mock.patch.object(session.time, "sleep") as sleep:
+            try:
+                return session.get("https://www.google.com/search", {})
+            finally:
+                self.requests = requests
+                self.sleep = sleep
+
+    def test_retries_through_another_proxy(self):
+        response = self._get([_response(503), _response(200)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(set(self.requests)), 2)
+
+    def test_retry_after_is_honored(self):
+        self._get([_response(429, headers={"Retry-After": "7"}), _response(200)])
+        self.sleep.assert_called_once_with(7)
+
+    def test_client_errors_are_not_retried(self):
+        with self.assertRaises(RequestError) as context:
+            self._get([_response(404), _response(200)])
+        self.assertEqual(context.exception.failure, retry.CLIENT_ERROR)
+        self.assertEqual(len(self.requests), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        with self.assertRaises(RequestError) as context:
+            self._get([_response(503)] * 5)
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertEqual(len(self.requests), 3)
+
+    def test_rate_limit_wait_is_bounded_by_deadline(self):
+        session.set_retry_policy(nb_times_retry=3, base_delay=0, deadline=5)
+        limiter = RateLimiter(1, 60)
+        limiter.reserve()
+        with mock.patch.object(
+            session, "get_rate_limiter", return_value=limiter
+        ), self.assertRaises(RequestError) as context:
+            self._get([_response(200)])
+        self.assertEqual(context.exception.failure, retry.RATE_LIMITED)
+        self.assertEqual(self.requests, [])
+        for call in self.sleep.call_args_list:
+            self.assertLess(call.args[0], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import unittest
+from unittest import mock
+from people_also_ask import serp
+from people_also_ask.serp import SerpResult
+
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(__file__),
+    "fixtures"
+)
+
+
+def read_fixture(html_filename):
+    with open(os.path.join(FIXTURES_DIR, html_filename), "r") as fd:
+        return fd.read()
+
+
+class TestSerpResult(unittest.TestCase):
+
+    def test_page_is_parsed_once(self):
+        result = SerpResult(
+            "why was ho chi minh a hero",
+            read_fixture("why_was_ho_chi_minh_a_hero.html"),
+        )
+        with mock.patch.object(
+            serp, "parse_document", wraps=serp.parse_document
+        ) as parse_document:
+            answer = result.answer
+            simple_answer = result.simple_answer
+            related_questions = result.related_questions
+        self.assertEqual(parse_document.call_count, 1)
+        self.assertTrue(answer["has_answer"])
+        self.assertEqual(answer["response"], simple_answer)
+        self.assertEqual(answer["related_questions"], related_questions)
+        self.assertIs(result.answer, answer)
+
+    def test_related_questions_only_parse_questions(self):
+        html = read_fixture("what_time_is_it.html")
+        result = SerpResult("what time is it", html)
+        related_questions = result.related_questions
+        self.assertNotIn("document", result.__dict__)
+        self.assertEqual(
+            related_questions,
+            SerpResult("what time is it", html).answer["related_questions"],
+        )
+
+    def test_page_without_featured_snippet(self):
+        result = SerpResult("empty", "<html><body></body></html>")
+        self.assertFalse(result.has_answer)
+        self.assertEqual(result.simple_answer, "")
+        self.assertEqual(result.answer, dict(
+            has_answer=False,
+            question="empty",
+            related_questions=[],
+        ))
+
+
+if __name__ == "__main__":
+    unittest.main()
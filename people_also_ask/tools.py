@@ -1,8 +1,7 @@
 #! /usr/bin/env python3
-import time
-import random
+import math
+import hashlib
 import traceback
-from contextlib import ContextDecorator
 from typing import Callable, List
 from people_also_ask.exceptions import FeaturedSnippetParserError
 
@@ -17,20 +16,19 @@ def raise_featuredsnippetparsererror_if_failed(func):
     return wrapper
 
 
-def retryable(nb_times_retry):
+class cached_property(object):
+    """property computed once per instance, then stored in its __dict__"""
 
-    def decorator(func: Callable):
+    def __init__(self, func: Callable):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
 
-        def wrapper(*args, **kwargs):
-            for _ in range(nb_times_retry-1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception:
-                    pass
-            return func(*args, **kwargs)
-
-        return wrapper
-    return decorator
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
 
 
 def itemize(lines: List[str]) -> List[str]:
@@ -63,22 +61,32 @@ def tabulate(header, table):
 def remove_redundant(elements): return list(dict.fromkeys(elements))
 
 
-class CallingSemaphore(ContextDecorator):
-
-    def __init__(self, nb_call_times_limit, expired_time):
-        self.nb_call_times_limit = nb_call_times_limit
-        self.expired_time = expired_time
-        self.called_timestamps = list()
-
-    def __enter__(self):
-        while len(self.called_timestamps) > self.nb_call_times_limit:
-            now = time.time()
-            self.called_timestamps = list(filter(
-                lambda x: now - x < self.expired_time,
-                self.called_timestamps
-            ))
-            time.sleep(random.random() * 2)
-        self.called_timestamps.append(time.time())
-
-    def __exit__(self, *exc):
-        pass
+class BloomFilter(object):
+    """
+    Set of strings of bounded memory, which may wrongly contain a string
+    with probability error_rate once capacity strings are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.nb_bits = max(1, int(
+            -capacity * math.log(error_rate) / math.log(2) ** 2
+        ))
+        self.nb_hashes = max(1, round(self.nb_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.nb_bits + 7) // 8)
+
+    def _positions(self, element: str):
+        digest = hashlib.blake2b(element.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.nb_hashes):
+            yield (h1 + i * h2) % self.nb_bits
+
+    def add(self, element: str):
+        for position in self._positions(element):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, element: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(element)
+        )
@@ -14,7 +14,14 @@ setuptools.setup(
     version="1.1.0",
     author="LE Van Tuan",
     author_email="leavantuan2312@gmail.com",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*"]),
+    package_data={
+        "people_also_ask": [
+            "plugins/article_generator/templates/*.html",
+            # pages served by people_also_ask.testing.ReplayServer
+            "tests/fixtures/*.html",
+        ],
+    },
     long_description=local_file('README.md').read(),
     long_description_content_type="text/markdown",
     url="https://github.com/lagranges/people_also_ask",
@@ -24,7 +31,6 @@ setuptools.setup(
         "Development Status :: 5 - Production/Stable",
         "Operating System :: MacOS",
         "Operating System :: Microsoft",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Typing :: Typed",
@@ -33,7 +39,12 @@ setuptools.setup(
         "beautifulsoup4",
         "requests",
         "jinja2",
-	"fake-useragent"
     ],
-    python_requires=">=3.6"
+    extras_require={
+        "aio": ["aiohttp"],
+        "lxml": ["lxml"],
+        "selectolax": ["selectolax"],
+        "fake_useragent": ["fake-useragent"],
+    },
+    python_requires=">=3.7"
 )